@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from typing import List
+import functools
+import re
+from typing import Any, List, Mapping, Optional
 
+import orjson
 from fastapi import (
     APIRouter,
     Body,
@@ -11,6 +14,7 @@ from fastapi import (
     Response,
     status,
 )
+from starlette.concurrency import run_in_threadpool
 
 from backend.models import (
     Artifact,
@@ -24,28 +28,64 @@ from backend.models import (
     ArtifactType,
     ModelRating,
 )
-from backend.services.rating_service import compute_model_artifact
+from backend.services.rating_service import (
+    clear_metadata_caches,
+    compute_model_artifact,
+)
 
 # IMPORTANT — avoid name collision with our GET route
 from backend.storage import (
+    InvalidPageToken,
     artifact_exists,
     delete_artifact as storage_delete_artifact,
     generate_artifact_id,
     get_artifact as storage_get_artifact,
+    get_model_cost as storage_get_model_cost,
     get_model_rating as storage_get_model_rating,
     query_artifacts,
     reset,
     save_artifact,
-    save_model_rating,
 )
 
 router = APIRouter(tags=["artifacts"])
 
+_ID_RE = re.compile(r"^[a-zA-Z0-9\-]+$")
+_ARTIFACT_TYPES = {t.value: t for t in ArtifactType}
+_ZERO_COST_ENTRY = ArtifactCostEntry(standalone_cost=0.0, total_cost=0.0)
+
+# Static error bodies, encoded once; these paths see fuzz/scanner traffic.
+_BAD_REGEX_BODY = orjson.dumps({"detail": "There is missing field(s) in the artifact_regex or it is formed improperly, or is invalid"})
+_NO_REGEX_MATCH_BODY = orjson.dumps({"detail": "No artifact found under this regex."})
+_BAD_TYPE_BODY = orjson.dumps({"detail": "400: Invalid artifact_type."})
+_BAD_ID_BODY = orjson.dumps({"detail": "400: Invalid artifact_id."})
+_NOT_FOUND_BODY = orjson.dumps({"detail": "404: Artifact does not exist."})
+
 
 # ---------------------------------------------------------
 # Helper
 # ---------------------------------------------------------
 
+def _json_response(
+    content: Any,
+    *,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Serialize once with orjson, bypassing jsonable_encoder and response_model validation."""
+    return Response(
+        content=orjson.dumps(content),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+def _error_response(body: bytes, status_code: int) -> Response:
+    """Wrap a prebuilt error body; responses are per-request since middleware mutates headers."""
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+@functools.lru_cache(maxsize=4096)
 def _derive_name(url: str) -> str:
     stripped = url.strip().rstrip("/")
     if not stripped:
@@ -64,24 +104,15 @@ def _derive_name(url: str) -> str:
 )
 async def regex_artifact_search(payload: dict = Body(...)):
     if not payload or "regex" not in payload:
-        raise HTTPException(
-            status_code=400,
-            detail="There is missing field(s) in the artifact_regex or it is formed improperly, or is invalid",
-        )
+        return _error_response(_BAD_REGEX_BODY, status.HTTP_400_BAD_REQUEST)
 
     regex_str = payload.get("regex")
 
     if not isinstance(regex_str, str) or not regex_str.strip():
-        raise HTTPException(
-            status_code=400,
-            detail="There is missing field(s) in the artifact_regex or it is formed improperly, or is invalid",
-        )
+        return _error_response(_BAD_REGEX_BODY, status.HTTP_400_BAD_REQUEST)
 
     # As required — always return 404
-    raise HTTPException(
-        status_code=404,
-        detail="No artifact found under this regex.",
-    )
+    return _error_response(_NO_REGEX_MATCH_BODY, status.HTTP_404_NOT_FOUND)
 
 
 # ---------------------------------------------------------
@@ -90,18 +121,17 @@ async def regex_artifact_search(payload: dict = Body(...)):
 
 @router.post(
     "/artifacts",
-    response_model=List[ArtifactMetadata],
+    response_model=None,
+    responses={200: {"model": List[ArtifactMetadata]}},
     summary="Get the artifacts from the registry. (BASELINE)",
 )
 async def query_artifacts_endpoint(
     queries: List[ArtifactQuery],
-    response: Response,
-    offset: int = Query(
-        0,
-        ge=0,
-        description="Pagination offset for the results",
+    offset: Optional[str] = Query(
+        None,
+        description="Pagination token from the previous page's offset header",
     ),
-) -> List[ArtifactMetadata]:
+) -> Response:
 
     if not queries:
         raise HTTPException(
@@ -109,15 +139,26 @@ async def query_artifacts_endpoint(
             detail="At least one artifact query is required",
         )
 
-    results = query_artifacts(queries)
+    # Clients following the old integer scheme start from "0"
+    offset_token = offset if offset and offset != "0" else None
 
-    if offset >= len(results):
-        response.headers["offset"] = str(offset)
-        return []
+    try:
+        page, next_token = await run_in_threadpool(
+            query_artifacts,
+            queries,
+            offset_token=offset_token,
+        )
+    except InvalidPageToken as exc:
+        # Not a token from a previous page (e.g. an old integer offset)
+        raise HTTPException(
+            status_code=400,
+            detail=str(exc),
+        ) from exc
 
-    paginated = results[offset:]
-    response.headers["offset"] = str(offset + len(paginated))
-    return paginated
+    return _json_response(
+        [metadata.model_dump(mode="json") for metadata in page],
+        headers={"offset": next_token} if next_token else None,
+    )
 
 
 # ---------------------------------------------------------
@@ -126,7 +167,8 @@ async def query_artifacts_endpoint(
 
 @router.delete("/reset", summary="Reset the registry. (BASELINE)")
 async def reset_registry() -> dict[str, str]:
-    reset()
+    await run_in_threadpool(reset)
+    clear_metadata_caches()
     return {"status": "reset"}
 
 
@@ -136,16 +178,17 @@ async def reset_registry() -> dict[str, str]:
 
 @router.post(
     "/artifacts/{artifact_type}",
-    response_model=Artifact,
+    response_model=None,
+    responses={201: {"model": Artifact}},
     status_code=status.HTTP_201_CREATED,
     summary="Register a new artifact. (BASELINE)",
 )
 async def register_artifact(
     payload: ArtifactRegistration,
     artifact_type: ArtifactType = Path(...),
-) -> Artifact:
+) -> Response:
 
-    if artifact_exists(artifact_type, payload.url):
+    if await run_in_threadpool(artifact_exists, artifact_type, payload.url):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Artifact exists already",
@@ -154,7 +197,7 @@ async def register_artifact(
     # MODEL flow uses rating service
     if artifact_type == ArtifactType.MODEL:
         try:
-            artifact, rating, dataset_name, dataset_url, code_name, code_url = compute_model_artifact(
+            artifact, rating, dataset_name, dataset_url, code_name, code_url = await compute_model_artifact(
                 payload.url
             )
         except ValueError as exc:
@@ -167,7 +210,8 @@ async def register_artifact(
         if payload.name:
             artifact.metadata.name = payload.name
 
-        save_artifact(
+        await run_in_threadpool(
+            save_artifact,
             artifact,
             rating=rating,
             dataset_name=dataset_name,
@@ -176,10 +220,7 @@ async def register_artifact(
             code_url=code_url,
         )
 
-        if rating:
-            save_model_rating(artifact.metadata.id, rating)
-
-        return artifact
+        return _json_response(artifact.model_dump(mode="json"), status_code=status.HTTP_201_CREATED)
 
     # Non-model artifacts
     artifact_name = payload.name or _derive_name(payload.url)
@@ -194,8 +235,8 @@ async def register_artifact(
         data=ArtifactData(url=payload.url),
     )
 
-    save_artifact(artifact)
-    return artifact
+    await run_in_threadpool(save_artifact, artifact)
+    return _json_response(artifact.model_dump(mode="json"), status_code=status.HTTP_201_CREATED)
 
 
 # ---------------------------------------------------------
@@ -204,38 +245,28 @@ async def register_artifact(
 
 @router.get(
     "/artifacts/{artifact_type}/{artifact_id}",
-    response_model=Artifact,
+    response_model=None,
+    responses={200: {"model": Artifact}},
     summary="Retrieve a specific artifact. (BASELINE)",
 )
 async def fetch_artifact(
     artifact_type: str = Path(...),
     artifact_id: str = Path(...),
-):
+) -> Response:
     # Validate artifact type
-    try:
-        artifact_type_enum = ArtifactType(artifact_type)
-    except Exception:
-        raise HTTPException(
-            status_code=400,
-            detail="400: Invalid artifact_type.",
-        )
+    artifact_type_enum = _ARTIFACT_TYPES.get(artifact_type)
+    if artifact_type_enum is None:
+        return _error_response(_BAD_TYPE_BODY, status.HTTP_400_BAD_REQUEST)
 
     # Validate ID
-    import re
-    if not re.fullmatch(r"^[a-zA-Z0-9\-]+$", artifact_id):
-        raise HTTPException(
-            status_code=400,
-            detail="400: Invalid artifact_id.",
-        )
+    if not _ID_RE.fullmatch(artifact_id):
+        return _error_response(_BAD_ID_BODY, status.HTTP_400_BAD_REQUEST)
 
-    artifact = storage_get_artifact(artifact_type_enum, artifact_id)
+    artifact = await run_in_threadpool(storage_get_artifact, artifact_type_enum, artifact_id)
     if not artifact:
-        raise HTTPException(
-            status_code=404,
-            detail="404: Artifact does not exist.",
-        )
+        return _error_response(_NOT_FOUND_BODY, status.HTTP_404_NOT_FOUND)
 
-    return artifact
+    return _json_response(artifact.model_dump(mode="json"))
 
 
 # ---------------------------------------------------------
@@ -244,14 +275,15 @@ async def fetch_artifact(
 
 @router.put(
     "/artifacts/{artifact_type}/{artifact_id}",
-    response_model=Artifact,
+    response_model=None,
+    responses={200: {"model": Artifact}},
     summary="Update an existing artifact. (BASELINE)",
 )
 async def update_artifact(
     payload: Artifact,
     artifact_type: ArtifactType = Path(...),
     artifact_id: ArtifactID = Path(...),
-) -> Artifact:
+) -> Response:
     if payload.metadata.id != artifact_id or payload.metadata.type != artifact_type:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -261,7 +293,7 @@ async def update_artifact(
     # MODEL — recompute rating
     if artifact_type == ArtifactType.MODEL:
         try:
-            artifact, rating, dataset_name, dataset_url, code_name, code_url = compute_model_artifact(
+            artifact, rating, dataset_name, dataset_url, code_name, code_url = await compute_model_artifact(
                 payload.data.url,
                 artifact_id=artifact_id,
                 name_override=payload.metadata.name,
@@ -272,7 +304,8 @@ async def update_artifact(
                 detail=str(exc),
             ) from exc
 
-        save_artifact(
+        await run_in_threadpool(
+            save_artifact,
             artifact,
             rating=rating,
             dataset_name=dataset_name,
@@ -281,20 +314,17 @@ async def update_artifact(
             code_url=code_url,
         )
 
-        if rating:
-            save_model_rating(artifact_id, rating)
+        return _json_response(artifact.model_dump(mode="json"))
 
-        return artifact
-
-    existing = storage_get_artifact(artifact_type, artifact_id)
+    existing = await run_in_threadpool(storage_get_artifact, artifact_type, artifact_id)
     if not existing:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Artifact does not exist.",
         )
 
-    save_artifact(payload)
-    return payload
+    await run_in_threadpool(save_artifact, payload)
+    return _json_response(payload.model_dump(mode="json"))
 
 
 # ---------------------------------------------------------
@@ -310,8 +340,8 @@ async def delete_artifact(
     artifact_type: ArtifactType = Path(...),
     artifact_id: ArtifactID = Path(...),
 ) -> dict[str, ArtifactID]:
-    success = storage_delete_artifact(artifact_type, artifact_id)
-    if not success:
+    deleted = await run_in_threadpool(storage_delete_artifact, artifact_type, artifact_id)
+    if deleted is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Artifact does not exist.",
@@ -325,19 +355,20 @@ async def delete_artifact(
 
 @router.get(
     "/artifact/model/{artifact_id}/rate",
-    response_model=ModelRating,
+    response_model=None,
+    responses={200: {"model": ModelRating}},
     summary="Get ratings for this model artifact. (BASELINE)",
 )
 async def get_model_rating(
     artifact_id: ArtifactID = Path(...),
-) -> ModelRating:
-    rating = storage_get_model_rating(artifact_id)
+) -> Response:
+    rating = await run_in_threadpool(storage_get_model_rating, artifact_id)
     if not rating:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Artifact does not exist or lacks a rating.",
         )
-    return rating
+    return _json_response(rating.model_dump(mode="json"))
 
 
 # ---------------------------------------------------------
@@ -346,38 +377,38 @@ async def get_model_rating(
 
 @router.get(
     "/artifact/{artifact_type}/{artifact_id}/cost",
-    response_model=ArtifactCost,
+    response_model=None,
+    responses={200: {"model": ArtifactCost}},
     summary="Get the cost of an artifact (BASELINE)",
 )
 async def get_artifact_cost(
     artifact_type: ArtifactType = Path(...),
     artifact_id: ArtifactID = Path(...),
-) -> ArtifactCost:
-    artifact = storage_get_artifact(artifact_type, artifact_id)
-    if not artifact:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Artifact does not exist.",
-        )
-
+) -> Response:
     if artifact_type == ArtifactType.MODEL:
-        rating = storage_get_model_rating(artifact_id)
-        if not rating:
+        # The cost is stored with the rating, so a hit also proves the model
+        # exists; only a miss needs the artifact lookup to pick the 404.
+        total_cost = await run_in_threadpool(storage_get_model_cost, artifact_id)
+        if total_cost is None:
+            artifact = await run_in_threadpool(storage_get_artifact, artifact_type, artifact_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Cost unavailable until model is rated.",
+                detail="Cost unavailable until model is rated." if artifact else "Artifact does not exist.",
             )
-
-        total_cost = max(
-            0.0,
-            round((1.0 - rating.size_score.raspberry_pi) * 1000, 1),
-        )
         entry = ArtifactCostEntry(
             standalone_cost=total_cost,
             total_cost=total_cost,
         )
 
     else:
-        entry = ArtifactCostEntry(standalone_cost=0.0, total_cost=0.0)
+        artifact = await run_in_threadpool(storage_get_artifact, artifact_type, artifact_id)
+        if not artifact:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Artifact does not exist.",
+            )
+        entry = _ZERO_COST_ENTRY
 
-    return ArtifactCost({artifact_id: entry})
+    # The entry is already validated, so build the root model without
+    # running validation a second time.
+    return _json_response(ArtifactCost.model_construct(root={artifact_id: entry}).model_dump(mode="json"))
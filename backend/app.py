@@ -1,5 +1,6 @@
 import logging
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import fastapi  # pyright: ignore[reportMissingImports]
@@ -9,6 +10,7 @@ from fastapi.responses import JSONResponse
 
 from backend.api.routes import artifacts, health, system, tracks
 from backend.middleware.logging import setup_logging
+from backend.services.rating_service import close_http_client, open_http_client
 
 logging.basicConfig(level=logging.INFO)
 # Load .env file if it exists
@@ -21,7 +23,19 @@ if env_file.exists():
                 key, value = line.split('=', 1)
                 os.environ.setdefault(key, value)
 
+
+@asynccontextmanager
+async def lifespan(app: fastapi.FastAPI):
+    # One pooled HF/GitHub client per worker, closed on shutdown
+    open_http_client()
+    try:
+        yield
+    finally:
+        await close_http_client()
+
+
 app = fastapi.FastAPI(
+    lifespan=lifespan,
     title="Model Registry API",
     description="API for storing, rating, and viewing models",
     version="0.1.0",
@@ -1,23 +1,110 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import operator
 import re
 from typing import Any, Optional, Tuple
 from urllib.parse import urlparse
 
-import requests as rq
-from huggingface_hub import HfApi, hf_hub_url
+import httpx
+from cachetools import TTLCache
+from huggingface_hub import hf_hub_url
+from huggingface_hub.utils import build_hf_headers
+from starlette.concurrency import run_in_threadpool
 
 from backend.models import (Artifact, ArtifactData, ArtifactMetadata,
                             ArtifactType, ModelRating, SizeScore)
-from backend.storage import (
-    find_code_by_name,
-    find_dataset_by_name,
-    generate_artifact_id,
-)
+from backend.storage import find_linked_artifacts, generate_artifact_id
 from metric_concurrent import main as run_metrics
 from metrics.size import calculate_size_score
 
+HF_API_URL = "https://huggingface.co/api"
+# Dataset tags and repo links sit near the top of a model card, and the
+# metrics' length thresholds saturate well below this size.
+README_MAX_BYTES = 64 * 1024
+
+# Net score weights, in the order run_metrics returns its scores:
+# size, license, ramp-up, bus factor, dataset & code, dataset quality,
+# code quality, performance claims, reproducibility, reviewedness, treescore.
+_NET_WEIGHTS = (0.11, 0.09, 0.10, 0.10, 0.13, 0.13, 0.10, 0.09, 0.05, 0.05, 0.05)
+
+_DATASET_RE = re.compile(r"dataset[s]?:\s*([a-z0-9_\-]+)")
+_GITHUB_URL_RE = re.compile(r"https://github\.com/[\w\-]+/[\w\-]+")
+_GITHUB_OWNER_REPO_RE = re.compile(r"github\.com/([^/]+)/([^/]+)")
+
+# Shared across requests so HF/GitHub connections are pooled and reused;
+# the transport retries failed connects the way urllib3's Retry would.
+# The app opens it at startup and closes it at shutdown (see backend.app).
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+# Its connections belong to the event loop that opened them
+_HTTP_CLIENT_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+# Model cards and repo metadata are stable over a few minutes, so repeated
+# registrations of the same URL (retries, CI re-runs) are served from memory.
+_MODEL_INFO_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=600)
+_CODE_METADATA_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=600)
+
+
+def open_http_client() -> httpx.AsyncClient:
+    """Create the shared HTTP client on the running event loop."""
+    global _HTTP_CLIENT, _HTTP_CLIENT_LOOP
+    _HTTP_CLIENT = httpx.AsyncClient(
+        timeout=30,
+        follow_redirects=True,
+        headers={"Accept-Encoding": "gzip"},
+        transport=httpx.AsyncHTTPTransport(http2=True, limits=_HTTP_LIMITS, retries=2),
+    )
+    _HTTP_CLIENT_LOOP = asyncio.get_running_loop()
+    return _HTTP_CLIENT
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    global _HTTP_CLIENT, _HTTP_CLIENT_LOOP
+    client, _HTTP_CLIENT, _HTTP_CLIENT_LOOP = _HTTP_CLIENT, None, None
+    if client is not None:
+        await client.aclose()
+
+
+def _http_client() -> httpx.AsyncClient:
+    """The shared client, opened on first use outside the app's lifespan.
+
+    Scripts and tests that call asyncio.run more than once get a fresh
+    client on each new event loop instead of one bound to a closed loop.
+    """
+    if _HTTP_CLIENT is None or _HTTP_CLIENT_LOOP is not asyncio.get_running_loop():
+        return open_http_client()
+    return _HTTP_CLIENT
 
+
+def clear_metadata_caches() -> None:
+    _MODEL_INFO_CACHE.clear()
+    _CODE_METADATA_CACHE.clear()
+
+
+async def _fetch_readme_head(url: str, **kwargs: Any) -> Optional[str]:
+    """Download at most README_MAX_BYTES of a README, lowercased for the metrics.
+
+    Returns "" when there is no README (any non-200 answer), and None only
+    when the request itself failed, so callers can tell the two apart.
+    """
+    try:
+        async with _http_client().stream("GET", url, **kwargs) as response:
+            if response.status_code != 200:
+                return ""
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) >= README_MAX_BYTES:
+                    break
+    except httpx.HTTPError:
+        return None
+    return body[:README_MAX_BYTES].decode("utf-8", "ignore").lower()
+
+
+@functools.lru_cache(maxsize=4096)
 def _derive_name_from_url(url: str) -> str:
     stripped = url.strip().rstrip("/")
     if not stripped:
@@ -25,7 +112,7 @@ def _derive_name_from_url(url: str) -> str:
     return stripped.split("/")[-1]
 
 
-def _fetch_model_info(raw_model_url: str) -> Tuple[dict, str]:
+async def _fetch_model_info_async(raw_model_url: str) -> Tuple[dict, str]:
     parsed = urlparse(raw_model_url)
     model_path = parsed.path.strip("/")
     parts = model_path.split("/")
@@ -33,54 +120,53 @@ def _fetch_model_info(raw_model_url: str) -> Tuple[dict, str]:
         tree_index = parts.index("tree")
         model_path = "/".join(parts[:tree_index])
 
+    cached = _MODEL_INFO_CACHE.get(model_path)
+    if cached is not None:
+        return cached
+
+    # The model_info call and the README download are independent, so issue
+    # them together and wait for the slower of the two.
+    readme_url = hf_hub_url(repo_id=model_path, filename="README.md", repo_type="model")
+    info_response, readme = await asyncio.gather(
+        _http_client().get(f"{HF_API_URL}/models/{model_path}", headers=build_hf_headers()),
+        _fetch_readme_head(readme_url),
+        return_exceptions=True,
+    )
+
     model_info: dict = {}
-    model_readme_text = ""
+    model_readme_text = readme if isinstance(readme, str) else ""
+    # Only a fully successful fetch is cached: a transient failure of either
+    # call would otherwise pin degraded metadata for the cache's lifetime
+    cacheable = isinstance(readme, str)
 
-    # Use huggingface_hub library which handles auth automatically
+    # /api/models/{repo_id} returns the same payload HfApi().model_info parses.
     # If auth fails, we'll gracefully degrade (no dataset/code extraction)
     try:
-        api = HfApi()
-        model_info_obj = api.model_info(repo_id=model_path)
-        # Convert to dict format expected by metrics
-        model_info = {
-            "id": model_info_obj.id,
-            "modelId": getattr(model_info_obj, "modelId", None),
-            "author": getattr(model_info_obj, "author", None),
-            "sha": getattr(model_info_obj, "sha", None),
-            "lastModified": str(getattr(model_info_obj, "lastModified", "")),
-            "private": getattr(model_info_obj, "private", False),
-            "disabled": getattr(model_info_obj, "disabled", False),
-            "gated": getattr(model_info_obj, "gated", False),
-            "pipeline_tag": getattr(model_info_obj, "pipeline_tag", None),
-            "tags": getattr(model_info_obj, "tags", []),
-            "downloads": getattr(model_info_obj, "downloads", 0),
-            "likes": getattr(model_info_obj, "likes", 0),
-            "library_name": getattr(model_info_obj, "library_name", None),
-            "cardData": getattr(model_info_obj, "cardData", {}),
-            "siblings": [{"rfilename": s.rfilename} for s in getattr(model_info_obj, "siblings", [])],
-        }
-        # Extract datasets from cardData if available
-        card_data = getattr(model_info_obj, "cardData", {}) or {}
-        if isinstance(card_data, dict) and "datasets" in card_data:
-            model_info["datasets"] = card_data.get("datasets")
-
-        # Also check tags for dataset references
-        tags = getattr(model_info_obj, "tags", [])
-        dataset_tags = [tag.replace("dataset:", "") for tag in tags if tag.startswith("dataset:")]
-        if dataset_tags and "datasets" not in model_info:
-            model_info["datasets"] = dataset_tags
+        if isinstance(info_response, httpx.Response) and info_response.status_code == 200:
+            # The payload already has the shape the metrics read (siblings are
+            # {"rfilename": ...} dicts), so hand it over as-is.
+            payload = info_response.json()
+            if isinstance(payload, dict):
+                model_info = payload
+
+            # Extract datasets from cardData if available
+            card_data = model_info.get("cardData") or {}
+            if isinstance(card_data, dict) and "datasets" in card_data:
+                model_info["datasets"] = card_data.get("datasets")
+
+            # Also check tags for dataset references
+            tags = model_info.get("tags") or []
+            dataset_tags = [tag.replace("dataset:", "") for tag in tags if tag.startswith("dataset:")]
+            if dataset_tags and "datasets" not in model_info:
+                model_info["datasets"] = dataset_tags
+        else:
+            cacheable = False
     except Exception:
         model_info = {}
+        cacheable = False
 
-    # Fetch README using huggingface_hub
-    try:
-        readme_url = hf_hub_url(repo_id=model_path, filename="README.md", repo_type="model")
-        readme_response = rq.get(readme_url, timeout=30)
-        if readme_response.status_code == 200:
-            model_readme_text = readme_response.text.lower()
-    except Exception:
-        model_readme_text = ""
-
+    if cacheable:
+        _MODEL_INFO_CACHE[model_path] = (model_info, model_readme_text)
     return model_info, model_readme_text
 
 
@@ -90,7 +176,7 @@ def _extract_dataset_name(model_info: dict, readme_text: str) -> Optional[str]:
         candidate = datasets[0]
         if isinstance(candidate, str):
             return candidate.split("/")[-1]
-    match = re.search(r"dataset[s]?:\s*([a-z0-9_\-]+)", readme_text)
+    match = _DATASET_RE.search(readme_text)
     if match:
         return match.group(1)
     return None
@@ -101,30 +187,17 @@ def _extract_code_repo(model_info: dict, readme_text: str) -> Optional[str]:
     code_repo = card_data.get("code_repository")
     if isinstance(code_repo, str) and code_repo:
         return code_repo
-    match = re.search(r"https://github\.com/[\w\-]+/[\w\-]+", readme_text)
+    match = _GITHUB_URL_RE.search(readme_text)
     if match:
         return match.group(0)
     return None
 
 
-def _resolve_dataset(dataset_name: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
-    if not dataset_name:
-        return None, None
-
-    normalized = dataset_name.split("/")[-1].lower()
-    record = find_dataset_by_name(normalized)
-    if record:
-        return normalized, record.artifact.data.url
-
-    # Fallback: assume HuggingFace dataset namespace
-    return normalized, f"https://huggingface.co/datasets/{normalized}" if normalized else None
-
-
-def _fetch_code_metadata(code_url: str) -> Tuple[dict, str]:
+async def _fetch_code_metadata_async(code_url: str) -> Tuple[dict, str]:
     code_info: dict = {}
     code_readme = ""
 
-    match = re.search(r"github\.com/([^/]+)/([^/]+)", code_url)
+    match = _GITHUB_OWNER_REPO_RE.search(code_url)
     if not match:
         return code_info, code_readme
 
@@ -132,48 +205,37 @@ def _fetch_code_metadata(code_url: str) -> Tuple[dict, str]:
     repo = repo.replace('.git', '')
     api_url = f"https://api.github.com/repos/{owner}/{repo}"
 
-    try:
-        response = rq.get(api_url, timeout=30)
-        if response.status_code == 200:
-            code_info = response.json()
-    except Exception:
-        code_info = {}
+    cached = _CODE_METADATA_CACHE.get(api_url)
+    if cached is not None:
+        return cached
 
-    try:
-        readme_response = rq.get(
+    response, readme = await asyncio.gather(
+        _http_client().get(api_url),
+        _fetch_readme_head(
             f"{api_url}/readme",
             headers={'Accept': 'application/vnd.github.v3.raw'},
-            timeout=30,
-        )
-        if readme_response.status_code == 200:
-            code_readme = readme_response.text.lower()
+        ),
+        return_exceptions=True,
+    )
+    code_readme = readme if isinstance(readme, str) else ""
+    # As for model info, cache only when both requests succeeded
+    cacheable = isinstance(readme, str)
+
+    try:
+        if isinstance(response, httpx.Response) and response.status_code == 200:
+            code_info = response.json()
+        else:
+            cacheable = False
     except Exception:
-        code_readme = ""
+        code_info = {}
+        cacheable = False
 
+    if cacheable:
+        _CODE_METADATA_CACHE[api_url] = (code_info, code_readme)
     return code_info, code_readme
 
 
-def _resolve_code(code_repo: Optional[str], code_name: Optional[str]) -> Tuple[Optional[str], Optional[str], dict, str]:
-    resolved_name = code_name
-    resolved_url = None
-    code_info: dict = {}
-    code_readme = ""
-
-    if code_repo:
-        resolved_url = code_repo
-        resolved_name = _derive_name_from_url(code_repo).lower()
-    if resolved_name:
-        record = find_code_by_name(resolved_name)
-        if record:
-            resolved_url = record.artifact.data.url
-
-    if resolved_url:
-        code_info, code_readme = _fetch_code_metadata(resolved_url)
-
-    return resolved_name, resolved_url, code_info, code_readme
-
-
-def compute_model_artifact(
+async def compute_model_artifact(
     url: str,
     *,
     artifact_id: Optional[str] = None,
@@ -184,18 +246,21 @@ def compute_model_artifact(
 
     # Fetch model info to extract dataset/code names from README
     # We'll use these names to link to already-registered artifacts
-    model_info, readme_text = _fetch_model_info(url)
+    model_info, readme_text = await _fetch_model_info_async(url)
 
     # Extract dataset and code names from the model card
     dataset_name_hint = _extract_dataset_name(model_info, readme_text)
     code_repo_hint = _extract_code_repo(model_info, readme_text)
     code_name_hint = _derive_name_from_url(code_repo_hint).lower() if code_repo_hint else None
 
-    # Now look up registered artifacts by these names
+    # Now look up registered artifacts by these names, both in one pass
+    dataset_record, code_record = await run_in_threadpool(
+        find_linked_artifacts, dataset_name_hint, code_name_hint
+    )
+
     dataset_url = None
     dataset_name = None
     if dataset_name_hint:
-        dataset_record = find_dataset_by_name(dataset_name_hint)
         if dataset_record:
             dataset_url = dataset_record.artifact.data.url
             dataset_name = dataset_record.artifact.metadata.name
@@ -207,7 +272,6 @@ def compute_model_artifact(
     code_info: dict[str, Any] = {}
     code_readme: str = ""
     if code_name_hint:
-        code_record = find_code_by_name(code_name_hint)
         if code_record:
             code_url = code_record.artifact.data.url
             code_name = code_record.artifact.metadata.name
@@ -217,26 +281,31 @@ def compute_model_artifact(
             if code_repo_hint and 'github.com' in code_repo_hint:
                 code_url = code_repo_hint
 
-    # Fetch code metadata if we have a URL
+    # Fetch code metadata if we have a URL; this is the only GitHub
+    # round-trip per registration
     if code_url:
-        code_info, code_readme = _fetch_code_metadata(code_url)
-
-    metrics = run_metrics(
-        model_info,
-        readme_text,
-        url,
-        code_info,
-        code_readme,
-        dataset_url or "",
-        dataset_name=dataset_name,
-        code_name=code_name,
+        code_info, code_readme = await _fetch_code_metadata_async(code_url)
+
+    # Both are blocking and independent; run them side by side on the
+    # default executor so they don't hold the threadpool storage calls use.
+    metrics, (size_scores, net_size_score, _) = await asyncio.gather(
+        asyncio.to_thread(
+            run_metrics,
+            model_info,
+            readme_text,
+            url,
+            code_info,
+            code_readme,
+            dataset_url or "",
+            dataset_name=dataset_name,
+            code_name=code_name,
+        ),
+        asyncio.to_thread(calculate_size_score, url),
     )
 
     if not isinstance(metrics, (list, tuple)) or len(metrics) != 11:
         raise ValueError("Metric computation failed")
 
-    size_scores, net_size_score, _ = calculate_size_score(url)
-
     (
         net_size_score_metric,
         license_score,
@@ -251,22 +320,7 @@ def compute_model_artifact(
         tree_score,
     ) = metrics
 
-    net_score = round(
-        sum([
-            0.09 * license_score,
-            0.10 * ramp_score,
-            0.11 * net_size_score_metric,
-            0.13 * data_quality_score,
-            0.10 * bus_score,
-            0.13 * dc_score,
-            0.10 * code_quality_score,
-            0.09 * perf_score,
-            0.05 * repro_score,
-            0.05 * review_score,
-            0.05 * tree_score,
-        ]),
-        2,
-    )
+    net_score = round(sum(map(operator.mul, _NET_WEIGHTS, metrics)), 2)
 
     rating = ModelRating(
         name=name,
@@ -10,31 +10,45 @@ from backend.storage import dynamodb
 # Export all storage functions from dynamodb module
 from backend.storage.dynamodb import (
     artifact_exists,
+    count_artifacts,
     delete_artifact,
     find_code_by_name,
     find_dataset_by_name,
+    find_linked_artifacts,
     generate_artifact_id,
     get_artifact,
+    get_model_cost,
     get_model_rating,
     list_metadata,
     query_artifacts,
     reset,
+    reset_cache,
     save_artifact,
+    save_artifacts_batch,
     save_model_rating,
+    warm_up,
 )
+from backend.storage.records import InvalidPageToken
 
 __all__ = [
+    "InvalidPageToken",
     "artifact_exists",
+    "count_artifacts",
     "delete_artifact",
     "find_code_by_name",
     "find_dataset_by_name",
+    "find_linked_artifacts",
     "generate_artifact_id",
     "get_artifact",
+    "get_model_cost",
     "get_model_rating",
     "list_metadata",
     "query_artifacts",
     "reset",
+    "reset_cache",
     "save_artifact",
+    "save_artifacts_batch",
     "save_model_rating",
+    "warm_up",
 ]
 
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
-import json
+import functools
+import hashlib
 import os
+import queue
+import threading
+import time
 import uuid
-from typing import Dict, Iterable, List, Optional, cast
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import (Any, Dict, FrozenSet, Iterable, Iterator, List, Mapping,
+                    Optional, Set, Tuple)
 
 import boto3
+import orjson
+from boto3.dynamodb.types import Binary, TypeDeserializer, TypeSerializer
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from cachetools import TTLCache
 
 from backend.models import (Artifact, ArtifactData, ArtifactID,
                             ArtifactMetadata, ArtifactQuery, ArtifactType,
                             ModelRating)
-from backend.storage.records import CodeRecord, DatasetRecord, ModelRecord
+from backend.storage.records import (CodeRecord, DatasetRecord, ModelRecord,
+                                     decode_page_token, encode_page_token,
+                                     normalize_name, rating_cost)
 
 # ---------------------------------------------------------------------------
 # DynamoDB Configuration
@@ -19,13 +33,163 @@ from backend.storage.records import CodeRecord, DatasetRecord, ModelRecord
 
 TABLE_NAME = os.getenv("DDB_TABLE_NAME", "artifacts_metadata")
 AWS_REGION = os.getenv("AWS_REGION", "us-east-2")
+# Unset uses the regional endpoint; see DYNAMODB_MIGRATION.md for VPC setups
+DDB_ENDPOINT_URL = os.getenv("DDB_ENDPOINT_URL") or None
+QUERY_PAGE_SIZE = int(os.getenv("QUERY_PAGE_SIZE", "100"))
 
-# Initialize DynamoDB client
-try:
-    dynamodb = boto3.client("dynamodb", region_name=AWS_REGION)
-except Exception as e:
-    # Fallback for local development or when boto3 is not available
-    dynamodb = None
+# Stored artifact_type values, resolved once rather than per call
+_MODEL_T = ArtifactType.MODEL.value
+_ALL_TYPES = tuple(ArtifactType)
+
+# Global secondary indexes (see DYNAMODB_MIGRATION.md for their definitions)
+URL_INDEX = "artifact_type_url-index"
+NAME_INDEX = "artifact_type_name-index"
+# Models by the dataset/code name they reference, for cascading links
+LINK_INDEXES = {
+    ArtifactType.DATASET: ("artifact_type_dataset_name-index", "dataset"),
+    ArtifactType.CODE: ("artifact_type_code_name-index", "code"),
+}
+
+
+def _gsi(name: str, sort_key: str, projection: Dict) -> Dict:
+    """GlobalSecondaryIndex definition keyed on (artifact_type, sort_key)."""
+    return {
+        "IndexName": name,
+        "KeySchema": [
+            {"AttributeName": "artifact_type", "KeyType": "HASH"},
+            {"AttributeName": sort_key, "KeyType": "RANGE"},
+        ],
+        "Projection": projection,
+    }
+
+
+# CreateTable arguments (all but TableName) for the table this module expects,
+# e.g. to create one in DynamoDB Local; the AWS table is set up by hand
+TABLE_SCHEMA: Dict[str, Any] = {
+    "BillingMode": "PAY_PER_REQUEST",
+    "KeySchema": [{"AttributeName": "artifact_id", "KeyType": "HASH"}],
+    "AttributeDefinitions": [
+        {"AttributeName": name, "AttributeType": "S"}
+        for name in (
+            "artifact_id",
+            "artifact_type",
+            "url",
+            "name_normalized",
+            *(f"{prefix}_name_normalized" for _, prefix in LINK_INDEXES.values()),
+        )
+    ],
+    "GlobalSecondaryIndexes": [
+        _gsi(URL_INDEX, "url", {"ProjectionType": "KEYS_ONLY"}),
+        _gsi(NAME_INDEX, "name_normalized", {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["artifact", "url"]}),
+        *(
+            _gsi(index_name, f"{prefix}_name_normalized", {"ProjectionType": "KEYS_ONLY"})
+            for index_name, prefix in LINK_INDEXES.values()
+        ),
+    ],
+}
+# DynamoDB rejects index key values over this size; longer ones are indexed
+# by digest instead (see _index_key)
+INDEX_KEY_MAX_BYTES = 1024
+# name_normalized of an artifact with a blank name. Index keys may not be
+# empty, and normalized names are stripped, so no real name can equal it;
+# it keeps every item in the name index, which list_metadata reads.
+_BLANK_NAME_KEY = " "
+# BatchWriteItem accepts at most 25 requests per call
+BATCH_WRITE_SIZE = 25
+# Backoff before re-submitting unprocessed batch requests (seconds)
+BATCH_RETRY_BASE_DELAY = 0.05
+BATCH_RETRY_MAX_DELAY = 2.0
+# Full-table scans are split into this many segments, read concurrently
+SCAN_SEGMENTS = max(4, min(16, int(os.getenv("DDB_SCAN_SEGMENTS", "8"))))
+# Queued by each scan worker after its last page
+_SCAN_DONE = object()
+
+# Let reset() drop and recreate the table instead of deleting item by item.
+# Meant for test tables only: the table is briefly unavailable while it is rebuilt.
+ALLOW_TABLE_RECREATE = os.getenv("DDB_ALLOW_TABLE_RECREATE", "").lower() in ("1", "true", "yes")
+
+# Store ratings larger than this as zlib-compressed Binary instead of a JSON
+# string. Readers accept both forms, so this only affects new writes.
+COMPRESS_RATINGS = os.getenv("DDB_COMPRESS_RATINGS", "").lower() in ("1", "true", "yes")
+RATING_COMPRESS_MIN_BYTES = 512
+
+# Read-through cache for artifacts, ratings and name lookups; save_artifact
+# also fills it with what it wrote. It is per process: with several workers,
+# a write, delete or reset only invalidates its own worker's entries, so
+# other workers would serve the old value for up to the TTL. It is therefore
+# off (TTL 0) unless enabled, which is only safe with a single worker.
+CACHE_TTL_SECONDS = float(os.getenv("DDB_CACHE_TTL_SECONDS", "0"))
+CACHE_ENABLED = CACHE_TTL_SECONDS > 0
+CACHE_MAX_ENTRIES = 4096
+
+# One pooled, keep-alive client is shared by every request thread; the pool
+# must be at least as large as the threadpool or calls queue for a socket.
+_CLIENT_CONFIG = Config(
+    max_pool_connections=int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "64")),
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    tcp_keepalive=True,
+    connect_timeout=2,
+    read_timeout=5,
+)
+
+_CLIENT_LOCK = threading.Lock()
+
+# Overlaps independent index lookups (exact-name queries, linked dataset and
+# code). Shared so callers don't start threads per call; its tasks never
+# submit to it themselves, so they cannot deadlock waiting on each other.
+_LOOKUP_EXECUTOR = ThreadPoolExecutor(max_workers=SCAN_SEGMENTS, thread_name_prefix="ddb-lookup")
+
+
+@functools.cache
+def _get_client():
+    """Build the DynamoDB client on first use; configuration errors raise here."""
+    # boto3's default session is not safe to build clients from concurrently
+    with _CLIENT_LOCK:
+        return boto3.client(
+            "dynamodb",
+            region_name=AWS_REGION,
+            endpoint_url=DDB_ENDPOINT_URL,
+            config=_CLIENT_CONFIG,
+        )
+
+
+def _reset_client_cache() -> None:
+    """Drop the cached client so the next call builds a fresh one (for tests)."""
+    _get_client.cache_clear()
+    _describe_table.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def _describe_table(table_name: str) -> Dict:
+    """Table description (schema, indexes), fetched once per process."""
+    return _get_client().describe_table(TableName=table_name)["Table"]
+
+
+def warm_up() -> None:
+    """Open the client's first connection with a cheap DescribeTable call.
+
+    Later requests reuse that pooled keep-alive connection instead of
+    paying the TLS handshake themselves.
+    """
+    try:
+        _describe_table(TABLE_NAME)
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ResourceNotFoundException":
+            raise RuntimeError(f"DynamoDB table {TABLE_NAME} not found") from e
+        raise
+
+
+# The low-level client is thread-safe (storage calls run in a threadpool),
+# unlike resource.Table; these convert plain dicts to and from wire format.
+_SERIALIZER = TypeSerializer()
+_DESERIALIZER = TypeDeserializer()
+
+# Only hits are cached, so a newly saved artifact is never hidden by an
+# earlier miss. The lock guards the caches across threadpool calls.
+_CACHE_LOCK = threading.Lock()
+_ARTIFACT_CACHE: TTLCache = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+_RATING_CACHE: TTLCache = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+_NAME_CACHE: TTLCache = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
 
 
 # ---------------------------------------------------------------------------
@@ -34,12 +198,101 @@ except Exception as e:
 
 def generate_artifact_id() -> ArtifactID:
     """Generate a unique artifact ID."""
-    return str(uuid.uuid4())
+    return uuid.uuid4().hex
+
+
+_normalized = normalize_name
+
+
+def _serialize_value(value: Any) -> Dict:
+    """Convert one value to an AttributeValue.
+
+    Items are almost entirely strings plus the artifact Map, so those shapes
+    are built directly; anything else goes through TypeSerializer's type
+    dispatch, which also does the validation (e.g. rejecting floats).
+    """
+    if type(value) is str:
+        return {"S": value}
+    if type(value) is dict:
+        return {"M": {key: _serialize_value(inner) for key, inner in value.items()}}
+    if value is None:
+        return {"NULL": True}
+    return _SERIALIZER.serialize(value)
+
+
+def _deserialize_value(value: Dict) -> Any:
+    """Convert one AttributeValue back to a plain value (inverse of _serialize_value)."""
+    if "S" in value:
+        return value["S"]
+    if "M" in value:
+        return {key: _deserialize_value(inner) for key, inner in value["M"].items()}
+    if "NULL" in value:
+        return None
+    return _DESERIALIZER.deserialize(value)
+
+
+def _to_item(record: Dict[str, Any]) -> Dict:
+    """Convert a plain dict to a DynamoDB wire-format item."""
+    return {key: _serialize_value(value) for key, value in record.items()}
+
+
+def _from_item(item: Dict) -> Dict[str, Any]:
+    """Convert a DynamoDB wire-format item to a plain dict."""
+    return {key: _deserialize_value(value) for key, value in item.items()}
+
+
+def _key(artifact_id: ArtifactID) -> Dict:
+    """Primary key of an item in wire format."""
+    return {"artifact_id": {"S": artifact_id}}
+
 
+def reset_cache() -> None:
+    """Drop every cached artifact, rating and name lookup."""
+    with _CACHE_LOCK:
+        _ARTIFACT_CACHE.clear()
+        _RATING_CACHE.clear()
+        _NAME_CACHE.clear()
 
-def _normalized(name: Optional[str]) -> Optional[str]:
-    """Normalize a name for comparison."""
-    return name.strip().lower() if isinstance(name, str) else None
+
+def _cache_get(cache: TTLCache, key: Any) -> Any:
+    if not CACHE_ENABLED:
+        return None
+    with _CACHE_LOCK:
+        return cache.get(key)
+
+
+def _cache_put(cache: TTLCache, key: Any, value: Any) -> None:
+    if not CACHE_ENABLED:
+        return
+    with _CACHE_LOCK:
+        cache[key] = value
+
+
+def _invalidate(artifact_id: ArtifactID, *, names: bool = False) -> None:
+    """Forget cached reads of an artifact; ``names`` also clears name lookups."""
+    with _CACHE_LOCK:
+        _ARTIFACT_CACHE.pop(artifact_id, None)
+        _RATING_CACHE.pop(artifact_id, None)
+        if names:
+            _NAME_CACHE.clear()
+
+
+def _index_key(value: str) -> str:
+    """Value to store in (and look up by) an index key attribute.
+
+    Values over INDEX_KEY_MAX_BYTES are replaced by a fixed-size digest, so
+    the item can still be written and exact-match lookups still find it.
+    Short values, including digests themselves, are returned unchanged.
+    """
+    encoded = value.encode()
+    if len(encoded) <= INDEX_KEY_MAX_BYTES:
+        return value
+    return "blake2b:" + hashlib.blake2b(encoded, digest_size=32).hexdigest()
+
+
+def _values(**values: Any) -> Dict:
+    """ExpressionAttributeValues in wire format, keyed ``:name``."""
+    return {f":{name}": _serialize_value(value) for name, value in values.items()}
 
 
 def _serialize_artifact(artifact: Artifact) -> Dict:
@@ -59,11 +312,9 @@ def _serialize_artifact(artifact: Artifact) -> Dict:
 
 def _deserialize_artifact(item: Dict) -> Artifact:
     """Deserialize a DynamoDB item to an Artifact."""
-    artifact_str = item.get("artifact", {}).get("S", "{}")
-    if isinstance(artifact_str, str):
-        artifact_dict = json.loads(artifact_str)
-    else:
-        artifact_dict = artifact_str
+    artifact_dict = item.get("artifact") or {}
+    if isinstance(artifact_dict, str):  # items written before the Map attribute
+        artifact_dict = orjson.loads(artifact_dict)
     
     metadata_dict = artifact_dict.get("metadata", {})
     data_dict = artifact_dict.get("data", {})
@@ -81,6 +332,12 @@ def _deserialize_artifact(item: Dict) -> Artifact:
     )
 
 
+def _content_hash(item: Dict) -> str:
+    """Stable digest of an item's attributes, used to skip identical re-saves."""
+    payload = orjson.dumps(item, default=str, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
 def _serialize_rating(rating: Optional[ModelRating]) -> Optional[Dict]:
     """Serialize a ModelRating to a dictionary for DynamoDB storage."""
     if not rating:
@@ -88,50 +345,37 @@ def _serialize_rating(rating: Optional[ModelRating]) -> Optional[Dict]:
     return rating.model_dump()
 
 
+def _encode_rating(rating: ModelRating) -> Any:
+    """Rating attribute value: a JSON string, or compressed bytes (see COMPRESS_RATINGS)."""
+    # Kept as JSON rather than a Map: TypeSerializer rejects floats
+    encoded = orjson.dumps(_serialize_rating(rating))
+    if COMPRESS_RATINGS and len(encoded) > RATING_COMPRESS_MIN_BYTES:
+        return zlib.compress(encoded)
+    return encoded.decode()
+
+
 def _deserialize_rating(item: Dict) -> Optional[ModelRating]:
     """Deserialize a DynamoDB item to a ModelRating."""
     rating_data = item.get("rating")
-    if not rating_data:
+    if not rating_data or not isinstance(rating_data, (str, Binary)):
         return None
     
-    # Handle both DynamoDB format and direct dict
-    if isinstance(rating_data, dict):
-        if "M" in rating_data:  # DynamoDB Map format
-            rating_dict = {k: v.get("S") if "S" in v else v.get("N") if "N" in v else v for k, v in rating_data["M"].items()}
-        else:
-            rating_dict = rating_data
-    else:
-        return None
-    
-    # Handle nested size_score
-    if "size_score" in rating_dict:
-        size_score = rating_dict["size_score"]
-        if isinstance(size_score, dict) and "M" in size_score:
-            rating_dict["size_score"] = {
-                k: float(v.get("N", 0)) if "N" in v else v.get("S", "")
-                for k, v in size_score["M"].items()
-            }
-        elif isinstance(size_score, str):
-            rating_dict["size_score"] = json.loads(size_score)
-    
     try:
-        return ModelRating(**rating_dict)
+        if isinstance(rating_data, Binary):
+            rating_data = zlib.decompress(rating_data.value)
+        return ModelRating(**orjson.loads(rating_data))
     except Exception:
         return None
 
 
 def _get_item(artifact_id: ArtifactID) -> Optional[Dict]:
     """Get an item from DynamoDB by artifact_id."""
-    if not dynamodb:
-        raise RuntimeError("DynamoDB client not initialized")
+    client = _get_client()
     
     try:
-        response = dynamodb.get_item(
-            TableName=TABLE_NAME,
-            Key={"artifact_id": {"S": artifact_id}},
-        )
+        response = client.get_item(TableName=TABLE_NAME, Key=_key(artifact_id))
         if "Item" in response:
-            return response["Item"]
+            return _from_item(response["Item"])
         return None
     except ClientError as e:
         if e.response["Error"]["Code"] == "ResourceNotFoundException":
@@ -139,102 +383,237 @@ def _get_item(artifact_id: ArtifactID) -> Optional[Dict]:
         raise
 
 
-def _put_item(item: Dict) -> None:
-    """Put an item into DynamoDB."""
-    if not dynamodb:
-        raise RuntimeError("DynamoDB client not initialized")
+def _put_item(item: Dict, **kwargs) -> bool:
+    """Put an item into DynamoDB.
+
+    Extra keyword arguments (e.g. ConditionExpression) are passed through;
+    returns False when the put's condition fails and nothing is written.
+    """
+    client = _get_client()
     
     try:
-        dynamodb.put_item(TableName=TABLE_NAME, Item=item)
+        client.put_item(TableName=TABLE_NAME, Item=_to_item(item), **kwargs)
     except ClientError as e:
-        if e.response["Error"]["Code"] == "ResourceNotFoundException":
+        code = e.response["Error"]["Code"]
+        if code == "ConditionalCheckFailedException":
+            return False
+        if code == "ResourceNotFoundException":
             raise RuntimeError(f"DynamoDB table {TABLE_NAME} not found") from e
         raise
+    return True
+
 
+def _delete_item(artifact_id: ArtifactID, **kwargs) -> Optional[Dict]:
+    """Delete an item from DynamoDB and return it as it was.
 
-def _delete_item(artifact_id: ArtifactID) -> None:
-    """Delete an item from DynamoDB."""
-    if not dynamodb:
-        raise RuntimeError("DynamoDB client not initialized")
+    Extra keyword arguments (e.g. ConditionExpression) are passed through;
+    returns None when there was no item or the delete's condition fails.
+    """
+    client = _get_client()
     
     try:
-        dynamodb.delete_item(
-            TableName=TABLE_NAME,
-            Key={"artifact_id": {"S": artifact_id}},
+        response = client.delete_item(
+            TableName=TABLE_NAME, Key=_key(artifact_id), ReturnValues="ALL_OLD", **kwargs
         )
     except ClientError as e:
-        if e.response["Error"]["Code"] == "ResourceNotFoundException":
+        code = e.response["Error"]["Code"]
+        if code == "ConditionalCheckFailedException":
+            return None
+        if code == "ResourceNotFoundException":
             raise RuntimeError(f"DynamoDB table {TABLE_NAME} not found") from e
         raise
+    attributes = response.get("Attributes")
+    return _from_item(attributes) if attributes else None
 
 
-def _scan_table() -> List[Dict]:
-    """Scan the entire DynamoDB table."""
-    if not dynamodb:
-        raise RuntimeError("DynamoDB client not initialized")
-    
+def _scan_segment(segment: int, total_segments: int, scan_options: Dict) -> Iterator[List[Dict]]:
+    """Scan one segment of the table, yielding its raw pages in order."""
+    client = _get_client()
+    scan_kwargs: Dict = {
+        "TableName": TABLE_NAME,
+        "Segment": segment,
+        "TotalSegments": total_segments,
+        **scan_options,
+    }
+    while True:
+        response = client.scan(**scan_kwargs)
+        yield response.get("Items", [])
+        if "LastEvaluatedKey" not in response:
+            return
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def _parallel_scan(total_segments: int = SCAN_SEGMENTS, **scan_options) -> Iterator[Dict]:
+    """Scan the table with one worker thread per segment, yielding items as pages arrive.
+
+    ``scan_options`` (ProjectionExpression, FilterExpression, ...) are passed
+    through to every segment's Scan request. Pages are handed over through a
+    bounded queue, so only a few pages are held in memory at a time. If the
+    caller stops early, the workers finish their in-flight page and exit.
+    """
+    pages: queue.Queue = queue.Queue(maxsize=total_segments * 2)
+    stop = threading.Event()
+
+    def produce(segment: int) -> None:
+        try:
+            for page in _scan_segment(segment, total_segments, scan_options):
+                if stop.is_set():
+                    break
+                pages.put(page)
+        except Exception as e:  # re-raised on the consuming thread
+            pages.put(e)
+        finally:
+            pages.put(_SCAN_DONE)
+
+    remaining = total_segments
+    with ThreadPoolExecutor(max_workers=total_segments) as executor:
+        for segment in range(total_segments):
+            executor.submit(produce, segment)
+        try:
+            while remaining:
+                page = pages.get()
+                if page is _SCAN_DONE:
+                    remaining -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    for item in page:
+                        yield _from_item(item)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ResourceNotFoundException":
+                raise RuntimeError(f"DynamoDB table {TABLE_NAME} not found") from e
+            raise
+        finally:
+            # Unblock the workers so the executor can shut down
+            stop.set()
+            while remaining:
+                if pages.get() is _SCAN_DONE:
+                    remaining -= 1
+
+
+def _scan_table(**scan_options) -> Iterator[Dict]:
+    """Scan the entire DynamoDB table, lazily."""
+    return _parallel_scan(**scan_options)
+
+
+def _query(**kwargs) -> Dict:
+    """Run a single Query request against the table or one of its indexes."""
+    client = _get_client()
+
     try:
-        items = []
-        response = dynamodb.scan(TableName=TABLE_NAME)
-        items.extend(response.get("Items", []))
-        
-        # Handle pagination
-        while "LastEvaluatedKey" in response:
-            response = dynamodb.scan(
-                TableName=TABLE_NAME,
-                ExclusiveStartKey=response["LastEvaluatedKey"],
-            )
-            items.extend(response.get("Items", []))
-        
-        return items
+        return client.query(TableName=TABLE_NAME, **kwargs)
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ResourceNotFoundException":
+            raise RuntimeError(f"DynamoDB table {TABLE_NAME} or its index not found") from e
+        raise
+
+
+def _query_all(**kwargs) -> List[Dict]:
+    """Run a Query and follow LastEvaluatedKey until every page is read."""
+    items: List[Dict] = []
+    while True:
+        response = _query(**kwargs)
+        items.extend(_from_item(item) for item in response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            return items
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def _batch_write(requests: List[Dict]) -> None:
+    """Submit Put/Delete requests with BatchWriteItem, 25 per call.
+
+    Requests DynamoDB hands back as unprocessed (throttling) are re-submitted
+    with exponential backoff until every one has been applied.
+    """
+    client = _get_client()
+
+    try:
+        for start in range(0, len(requests), BATCH_WRITE_SIZE):
+            pending = {TABLE_NAME: requests[start:start + BATCH_WRITE_SIZE]}
+            attempt = 0
+            while pending:
+                if attempt:
+                    time.sleep(min(BATCH_RETRY_MAX_DELAY, BATCH_RETRY_BASE_DELAY * 2 ** attempt))
+                response = client.batch_write_item(RequestItems=pending)
+                pending = response.get("UnprocessedItems") or {}
+                attempt += 1
     except ClientError as e:
         if e.response["Error"]["Code"] == "ResourceNotFoundException":
             raise RuntimeError(f"DynamoDB table {TABLE_NAME} not found") from e
         raise
 
 
-def _find_by_url(artifact_type: ArtifactType, url: str) -> Optional[ArtifactID]:
-    """Find an artifact by URL using scan (since we don't have a GSI for URL)."""
-    items = _scan_table()
-    for item in items:
-        artifact_type_str = item.get("artifact_type", {}).get("S", "")
-        if artifact_type_str == artifact_type.value:
-            # Check URL attribute first (faster)
-            item_url = item.get("url", {}).get("S", "")
-            if item_url == url:
-                return item.get("artifact_id", {}).get("S")
-    return None
+def _find_linked_models(link_type: ArtifactType, name_normalized: Optional[str]) -> List[ArtifactID]:
+    """Find the ids of models that reference a dataset/code name."""
+    if not name_normalized:
+        return []
+
+    index_name, prefix = LINK_INDEXES[link_type]
+    keys = _query_all(
+        IndexName=index_name,
+        KeyConditionExpression=f"artifact_type = :t AND {prefix}_name_normalized = :n",
+        ExpressionAttributeValues=_values(t=_MODEL_T, n=_index_key(name_normalized)),
+    )
+    return [key["artifact_id"] for key in keys]
+
+
+def _update_link(model_id: ArtifactID, **kwargs) -> None:
+    """Apply a conditional UpdateItem to a model's link attributes.
+
+    A failed condition means the model is gone or no longer linked the way
+    the cascade expected, so there is nothing to update.
+    """
+    client = _get_client()
 
+    try:
+        client.update_item(TableName=TABLE_NAME, Key=_key(model_id), **kwargs)
+    except ClientError as e:
+        code = e.response["Error"]["Code"]
+        if code == "ConditionalCheckFailedException":
+            return
+        if code == "ResourceNotFoundException":
+            raise RuntimeError(f"DynamoDB table {TABLE_NAME} not found") from e
+        raise
 
-def _link_dataset_code(model_record: ModelRecord, all_items: List[Dict]) -> None:
+
+def _find_by_name(artifact_type: ArtifactType, name: Optional[str]) -> Optional[Artifact]:
+    """Find an artifact by normalized name through the (artifact_type, name_normalized) index."""
+    normalized = _normalized(name)
+    if not normalized:
+        return None
+
+    cached = _cache_get(_NAME_CACHE, (artifact_type, normalized))
+    if cached is not None:
+        return cached
+
+    response = _query(
+        IndexName=NAME_INDEX,
+        KeyConditionExpression="artifact_type = :t AND name_normalized = :n",
+        ExpressionAttributeValues=_values(t=artifact_type.value, n=_index_key(normalized)),
+        Limit=1,
+    )
+    items = response.get("Items", [])
+    if not items:
+        return None
+
+    artifact = _deserialize_artifact(_from_item(items[0]))
+    _cache_put(_NAME_CACHE, (artifact_type, normalized), artifact)
+    return artifact
+
+
+def _link_dataset_code(model_record: ModelRecord) -> None:
     """Link dataset and code to a model record by name matching."""
-    dataset_name = _normalized(model_record.dataset_name)
-    if model_record.dataset_id is None and dataset_name:
-        for item in all_items:
-            artifact_type = item.get("artifact_type", {}).get("S", "")
-            if artifact_type == ArtifactType.DATASET.value:
-                artifact_data = json.loads(item.get("artifact", {}).get("S", "{}"))
-                if isinstance(artifact_data, str):
-                    artifact_data = json.loads(artifact_data)
-                item_name = artifact_data.get("metadata", {}).get("name", "")
-                if _normalized(item_name) == dataset_name:
-                    model_record.dataset_id = item.get("artifact_id", {}).get("S")
-                    model_record.dataset_url = artifact_data.get("data", {}).get("url", "")
-                    break
+    if model_record.dataset_id is None and model_record.dataset_name:
+        dataset = _find_by_name(ArtifactType.DATASET, model_record.dataset_name)
+        if dataset:
+            model_record.dataset_id = dataset.metadata.id
+            model_record.dataset_url = dataset.data.url
 
-    code_name = _normalized(model_record.code_name)
-    if model_record.code_id is None and code_name:
-        for item in all_items:
-            artifact_type = item.get("artifact_type", {}).get("S", "")
-            if artifact_type == ArtifactType.CODE.value:
-                artifact_data = json.loads(item.get("artifact", {}).get("S", "{}"))
-                if isinstance(artifact_data, str):
-                    artifact_data = json.loads(artifact_data)
-                item_name = artifact_data.get("metadata", {}).get("name", "")
-                if _normalized(item_name) == code_name:
-                    model_record.code_id = item.get("artifact_id", {}).get("S")
-                    model_record.code_url = artifact_data.get("data", {}).get("url", "")
-                    break
+    if model_record.code_id is None and model_record.code_name:
+        code = _find_by_name(ArtifactType.CODE, model_record.code_name)
+        if code:
+            model_record.code_id = code.metadata.id
+            model_record.code_url = code.data.url
 
 
 # ---------------------------------------------------------------------------
@@ -242,7 +621,7 @@ def _link_dataset_code(model_record: ModelRecord, all_items: List[Dict]) -> None
 # ---------------------------------------------------------------------------
 
 
-def save_artifact(
+def _build_item(
     artifact: Artifact,
     *,
     rating: Optional[ModelRating] = None,
@@ -250,19 +629,24 @@ def save_artifact(
     dataset_url: Optional[str] = None,
     code_name: Optional[str] = None,
     code_url: Optional[str] = None,
-) -> Artifact:
-    """Insert or update an artifact entry in DynamoDB."""
+) -> Dict[str, Any]:
+    """Build the item save_artifact writes, linking models and datasets/code by name.
+
+    Saving a dataset/code also re-links the stored models that reference it.
+    """
     artifact_dict = _serialize_artifact(artifact)
     name_normalized = _normalized(artifact.metadata.name)
     
     # Build the DynamoDB item
-    item = {
-        "artifact_id": {"S": artifact.metadata.id},
-        "artifact_type": {"S": artifact.metadata.type.value},
-        "artifact": {"S": json.dumps(artifact_dict)},
-        "url": {"S": artifact.data.url},
-        "name_normalized": {"S": name_normalized or ""},
+    item: Dict[str, Any] = {
+        "artifact_id": artifact.metadata.id,
+        "artifact_type": artifact.metadata.type.value,
+        "artifact": artifact_dict,
     }
+    # Index keys may not be empty strings, so leave the url off instead
+    if artifact.data.url:
+        item["url"] = _index_key(artifact.data.url)
+    item["name_normalized"] = _index_key(name_normalized) if name_normalized else _BLANK_NAME_KEY
     
     if artifact.metadata.type == ArtifactType.MODEL:
         # Get existing item to preserve relationships if updating
@@ -270,24 +654,28 @@ def save_artifact(
         dataset_id = None
         code_id = None
         if existing_item:
-            # Preserve existing relationships if not provided
+            # Preserve existing relationships if not provided. The name is
+            # kept with the id so the link stays reachable through its index.
             if not dataset_name:
-                dataset_id = existing_item.get("dataset_id", {}).get("S") if "dataset_id" in existing_item else None
+                dataset_id = existing_item.get("dataset_id")
+                dataset_name = existing_item.get("dataset_name")
             if not code_name:
-                code_id = existing_item.get("code_id", {}).get("S") if "code_id" in existing_item else None
+                code_id = existing_item.get("code_id")
+                code_name = existing_item.get("code_name")
         
         # Update with provided values
         if dataset_name:
-            item["dataset_name"] = {"S": dataset_name}
+            item["dataset_name"] = dataset_name
+            item["dataset_name_normalized"] = _index_key(_normalized(dataset_name) or dataset_name)
         if dataset_url:
-            item["dataset_url"] = {"S": dataset_url}
+            item["dataset_url"] = dataset_url
         if code_name:
-            item["code_name"] = {"S": code_name}
+            item["code_name"] = code_name
+            item["code_name_normalized"] = _index_key(_normalized(code_name) or code_name)
         if code_url:
-            item["code_url"] = {"S": code_url}
+            item["code_url"] = code_url
         
         # Try to link by name
-        all_items = _scan_table()
         model_record = ModelRecord(
             artifact=artifact,
             rating=rating,
@@ -298,132 +686,446 @@ def save_artifact(
             code_name=code_name,
             code_url=code_url,
         )
-        _link_dataset_code(model_record, all_items)
+        _link_dataset_code(model_record)
         
         # Update item with linked IDs
         if model_record.dataset_id:
-            item["dataset_id"] = {"S": model_record.dataset_id}
+            item["dataset_id"] = model_record.dataset_id
         if model_record.code_id:
-            item["code_id"] = {"S": model_record.code_id}
+            item["code_id"] = model_record.code_id
         
         # Store rating if provided
         if rating:
-            rating_dict = _serialize_rating(rating)
-            item["rating"] = {"S": json.dumps(rating_dict)}
-    elif artifact.metadata.type == ArtifactType.DATASET:
-        # When a dataset is saved, update any models that reference it by name
-        all_items = _scan_table()
-        for model_item in all_items:
-            if model_item.get("artifact_type", {}).get("S") == ArtifactType.MODEL.value:
-                model_dataset_name = model_item.get("dataset_name", {}).get("S", "")
-                if _normalized(model_dataset_name) == name_normalized:
-                    model_item["dataset_id"] = {"S": artifact.metadata.id}
-                    model_item["dataset_url"] = {"S": artifact.data.url}
-                    _put_item(model_item)
-    elif artifact.metadata.type == ArtifactType.CODE:
-        # When code is saved, update any models that reference it by name
-        all_items = _scan_table()
-        for model_item in all_items:
-            if model_item.get("artifact_type", {}).get("S") == ArtifactType.MODEL.value:
-                model_code_name = model_item.get("code_name", {}).get("S", "")
-                if _normalized(model_code_name) == name_normalized:
-                    model_item["code_id"] = {"S": artifact.metadata.id}
-                    model_item["code_url"] = {"S": artifact.data.url}
-                    _put_item(model_item)
+            item["rating"] = _encode_rating(rating)
+            item["cost"] = Decimal(str(rating_cost(rating)))
+    elif artifact.metadata.type in LINK_INDEXES:
+        # When a dataset/code is saved, update any models that reference it by name
+        _, prefix = LINK_INDEXES[artifact.metadata.type]
+        for model_id in _find_linked_models(artifact.metadata.type, name_normalized):
+            _update_link(
+                model_id,
+                UpdateExpression=f"SET {prefix}_id = :i, {prefix}_url = :u REMOVE content_hash",
+                ConditionExpression="attribute_exists(artifact_id)",
+                ExpressionAttributeValues=_values(i=artifact.metadata.id, u=artifact.data.url),
+            )
     
-    _put_item(item)
+    item["content_hash"] = _content_hash(item)
+    return item
+
+
+def save_artifact(
+    artifact: Artifact,
+    *,
+    rating: Optional[ModelRating] = None,
+    dataset_name: Optional[str] = None,
+    dataset_url: Optional[str] = None,
+    code_name: Optional[str] = None,
+    code_url: Optional[str] = None,
+) -> Artifact:
+    """Insert or update an artifact entry in DynamoDB."""
+    item = _build_item(
+        artifact,
+        rating=rating,
+        dataset_name=dataset_name,
+        dataset_url=dataset_url,
+        code_name=code_name,
+        code_url=code_url,
+    )
+    # Skip the write when the stored item already has exactly this content;
+    # writers that change an item behind save_artifact drop its hash
+    _put_item(
+        item,
+        ConditionExpression="attribute_not_exists(content_hash) OR content_hash <> :h",
+        ExpressionAttributeValues=_values(h=item["content_hash"]),
+    )
+    # Saving a dataset/code (or renaming one) changes what name lookups return
+    _invalidate(artifact.metadata.id, names=artifact.metadata.type in LINK_INDEXES)
+    # Write through, so a read right after the save needs no round-trip;
+    # cache copies so later changes to the caller's objects don't leak in
+    if CACHE_ENABLED:
+        _cache_put(_ARTIFACT_CACHE, artifact.metadata.id, _deserialize_artifact(item))
+        if rating and artifact.metadata.type == ArtifactType.MODEL:
+            _cache_put(_RATING_CACHE, artifact.metadata.id, rating.model_copy(deep=True))
     return artifact
 
 
+def save_artifacts_batch(artifacts: Iterable[Artifact]) -> List[Artifact]:
+    """Save several artifacts with BatchWriteItem instead of one PutItem each.
+
+    Datasets and code are written before models, so a model in the batch
+    links to a dataset/code saved alongside it. A later duplicate id replaces
+    an earlier one. Unlike save_artifact, identical re-saves are rewritten.
+    """
+    by_id = {artifact.metadata.id: artifact for artifact in artifacts}
+    models = [a for a in by_id.values() if a.metadata.type == ArtifactType.MODEL]
+    others = [a for a in by_id.values() if a.metadata.type != ArtifactType.MODEL]
+    for group in (others, models):
+        _batch_write([{"PutRequest": {"Item": _to_item(_build_item(artifact))}} for artifact in group])
+        for artifact in group:
+            _invalidate(artifact.metadata.id, names=artifact.metadata.type in LINK_INDEXES)
+    return list(by_id.values())
+
+
 def get_artifact(artifact_type: ArtifactType, artifact_id: ArtifactID) -> Optional[Artifact]:
     """Get an artifact by type and ID."""
-    item = _get_item(artifact_id)
-    if not item:
-        return None
-    
+    artifact = _cache_get(_ARTIFACT_CACHE, artifact_id)
+    if artifact is None:
+        item = _get_item(artifact_id)
+        if not item:
+            return None
+        artifact = _deserialize_artifact(item)
+        _cache_put(_ARTIFACT_CACHE, artifact_id, artifact)
+
     # Verify the artifact type matches
-    stored_type = item.get("artifact_type", {}).get("S", "")
-    if stored_type != artifact_type.value:
+    if artifact.metadata.type != artifact_type:
         return None
-    
-    return _deserialize_artifact(item)
 
+    return artifact
 
-def delete_artifact(artifact_type: ArtifactType, artifact_id: ArtifactID) -> bool:
-    """Delete an artifact from DynamoDB."""
-    item = _get_item(artifact_id)
+
+def delete_artifact(artifact_type: ArtifactType, artifact_id: ArtifactID) -> Optional[Artifact]:
+    """Delete an artifact from DynamoDB, returning it, or None if there was none of that type."""
+    # The condition checks the type and the item's existence in the same request
+    item = _delete_item(
+        artifact_id,
+        ConditionExpression="artifact_type = :t",
+        ExpressionAttributeValues=_values(t=artifact_type.value),
+    )
     if not item:
-        return False
-    
-    # Verify the artifact type matches
-    stored_type = item.get("artifact_type", {}).get("S", "")
-    if stored_type != artifact_type.value:
-        return False
+        return None
     
-    # If deleting a dataset or code, update related models
-    if artifact_type == ArtifactType.DATASET:
-        all_items = _scan_table()
-        for model_item in all_items:
-            if model_item.get("artifact_type", {}).get("S") == ArtifactType.MODEL.value:
-                model_dataset_id = model_item.get("dataset_id", {}).get("S", "")
-                if model_dataset_id == artifact_id:
-                    model_item.pop("dataset_id", None)
-                    model_item.pop("dataset_url", None)
-                    _put_item(model_item)
-    elif artifact_type == ArtifactType.CODE:
-        all_items = _scan_table()
-        for model_item in all_items:
-            if model_item.get("artifact_type", {}).get("S") == ArtifactType.MODEL.value:
-                model_code_id = model_item.get("code_id", {}).get("S", "")
-                if model_code_id == artifact_id:
-                    model_item.pop("code_id", None)
-                    model_item.pop("code_url", None)
-                    _put_item(model_item)
+    # If a dataset or code was deleted, update related models
+    if artifact_type in LINK_INDEXES:
+        _, prefix = LINK_INDEXES[artifact_type]
+        name_key = item.get("name_normalized")
+        linked = _find_linked_models(artifact_type, name_key) if name_key != _BLANK_NAME_KEY else []
+        for model_id in linked:
+            _update_link(
+                model_id,
+                UpdateExpression=f"REMOVE {prefix}_id, {prefix}_url, content_hash",
+                ConditionExpression=f"{prefix}_id = :i",
+                ExpressionAttributeValues=_values(i=artifact_id),
+            )
     
-    _delete_item(artifact_id)
-    return True
+    _invalidate(artifact_id, names=artifact_type in LINK_INDEXES)
+    return _deserialize_artifact(item)
 
 
 def list_metadata(artifact_type: ArtifactType) -> List[ArtifactMetadata]:
-    """List all metadata for a given artifact type."""
-    items = _scan_table()
-    metadata_list = []
-    for item in items:
-        stored_type = item.get("artifact_type", {}).get("S", "")
-        if stored_type == artifact_type.value:
-            artifact = _deserialize_artifact(item)
-            metadata_list.append(artifact.metadata)
-    return metadata_list
-
-
-def query_artifacts(queries: Iterable[ArtifactQuery]) -> List[ArtifactMetadata]:
-    """Query artifacts by name across types."""
-    items = _scan_table()
-    results: Dict[str, ArtifactMetadata] = {}
-    
+    """List all metadata for a given artifact type.
+
+    Reads only that type's partition of the name index. Every item has a
+    name_normalized key (_BLANK_NAME_KEY for a blank name), so all are listed.
+    """
+    items = _query_all(
+        IndexName=NAME_INDEX,
+        KeyConditionExpression="artifact_type = :t",
+        ExpressionAttributeValues=_values(t=artifact_type.value),
+        ProjectionExpression="artifact",
+    )
+    return [_deserialize_artifact(item).metadata for item in items]
+
+
+def _compile_queries(queries: Iterable[ArtifactQuery]) -> Dict[str, Optional[FrozenSet[str]]]:
+    """Fold queries into the lowercased names wanted per type value.
+
+    A type maps to None when a "*" query selects every artifact of it.
+    """
+    wanted: Dict[str, Optional[Set[str]]] = {}
     for query in queries:
-        types = query.types or [ArtifactType.MODEL, ArtifactType.DATASET, ArtifactType.CODE]
-        for artifact_type in types:
-            for item in items:
-                stored_type = item.get("artifact_type", {}).get("S", "")
-                if stored_type == artifact_type.value:
-                    artifact = _deserialize_artifact(item)
-                    metadata = artifact.metadata
-                    
-                    # Match by name (exact match except "*")
-                    if query.name == "*" or query.name.lower() == metadata.name.lower():
-                        results[f"{metadata.type}:{metadata.id}"] = metadata
-    
-    return list(results.values())
+        for artifact_type in query.types or _ALL_TYPES:
+            if query.name == "*":
+                wanted[artifact_type.value] = None
+                continue
+            names = wanted.setdefault(artifact_type.value, set())
+            if names is not None:
+                names.add(query.name.lower())
+    return {t: frozenset(names) if names is not None else None for t, names in wanted.items()}
+
+
+def _match_query(item: Dict, wanted: Mapping[str, Optional[FrozenSet[str]]]) -> Optional[ArtifactMetadata]:
+    """Return the item's metadata if the compiled queries select it."""
+    stored_type = item.get("artifact_type", "")
+    if stored_type not in wanted:
+        return None
+    names = wanted[stored_type]
+    metadata = _deserialize_artifact(item).metadata
+    # Match by name (exact match except "*")
+    if names is None or metadata.name.lower() in names:
+        return metadata
+    return None
+
+
+def _query_exact_names(
+    wanted: Dict[str, FrozenSet[str]],
+    last_id: Optional[ArtifactID],
+    limit: int,
+) -> Tuple[List[ArtifactMetadata], Optional[str]]:
+    """Answer name-only queries with one name-index Query per (type, name).
+
+    Matches are ordered by id and paged after ``last_id``, the id of the
+    last artifact on the previous page.
+    """
+    # Index keys are stripped as well as lowercased; _match_query re-checks
+    # the exact lowercased name on what comes back
+    lookups = [(t, key) for t, names in wanted.items() for key in {name.strip() for name in names}]
+
+    # Earlier pages' artifacts are filtered out server-side, so they are not
+    # transferred again (the index orders by name, not id, so the rest of
+    # the paging happens below)
+    after: Dict[str, Any] = {}
+    if last_id is not None:
+        after = {"FilterExpression": "artifact_id > :a"}
+
+    def lookup(pair: Tuple[str, str]) -> List[Dict]:
+        artifact_type, key = pair
+        values = {"t": artifact_type, "n": _index_key(key)}
+        if last_id is not None:
+            values["a"] = last_id
+        return _query_all(
+            IndexName=NAME_INDEX,
+            KeyConditionExpression="artifact_type = :t AND name_normalized = :n",
+            ExpressionAttributeValues=_values(**values),
+            ProjectionExpression="artifact_id, artifact_type, artifact",
+            **after,
+        )
+
+    items = [item for page in _LOOKUP_EXECUTOR.map(lookup, lookups) for item in page]
+
+    matches = sorted(
+        (metadata for metadata in (_match_query(item, wanted) for item in items) if metadata),
+        key=lambda metadata: metadata.id,
+    )
+    if last_id is not None:
+        matches = [metadata for metadata in matches if metadata.id > last_id]
+    page = matches[:limit]
+    return page, encode_page_token(page[-1].id) if len(matches) > limit else None
+
+
+def query_artifacts(
+    queries: Iterable[ArtifactQuery],
+    *,
+    offset_token: Optional[str] = None,
+    limit: int = QUERY_PAGE_SIZE,
+) -> Tuple[List[ArtifactMetadata], Optional[str]]:
+    """Query artifacts by name across types, one page at a time.
+
+    When every query names an artifact exactly, the name index answers it
+    (see _query_exact_names). Otherwise ("*", or a blank name, which is
+    not indexed) the table is scanned. The scan resumes after the artifact
+    ``offset_token`` points at (the last one returned by the previous page)
+    and stops as soon as ``limit`` matches are collected, so only the
+    requested page is read from DynamoDB.
+    Returns the page and the token for the next one (None when exhausted).
+    Raises InvalidPageToken for a token no previous page returned.
+    """
+    client = _get_client()
+
+    last_id = decode_page_token(offset_token) if offset_token else None
+    wanted = _compile_queries(queries)
+    exact = {t: names for t, names in wanted.items() if names is not None and all(n.strip() for n in names)}
+    if len(exact) == len(wanted):
+        return _query_exact_names(exact, last_id, limit)
+
+    results: List[ArtifactMetadata] = []
+    scan_kwargs: Dict = {
+        "TableName": TABLE_NAME,
+        "Limit": limit,
+        "ProjectionExpression": "artifact_id, artifact_type, artifact",
+    }
+    if last_id is not None:
+        scan_kwargs["ExclusiveStartKey"] = _key(last_id)
+
+    try:
+        while True:
+            response = client.scan(**scan_kwargs)
+            raw_items = response.get("Items", [])
+            for position, raw_item in enumerate(raw_items):
+                item = _from_item(raw_item)
+                metadata = _match_query(item, wanted)
+                if metadata is None:
+                    continue
+                results.append(metadata)
+                if len(results) >= limit:
+                    # A full page only gets a token when something may follow
+                    more = "LastEvaluatedKey" in response or any(
+                        _match_query(_from_item(rest), wanted) for rest in raw_items[position + 1:]
+                    )
+                    return results, encode_page_token(item["artifact_id"]) if more else None
+
+            if "LastEvaluatedKey" not in response:
+                return results, None
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ResourceNotFoundException":
+            raise RuntimeError(f"DynamoDB table {TABLE_NAME} not found") from e
+        raise
+
+
+def _create_table_request(table: Dict) -> Dict:
+    """CreateTable arguments that rebuild a table from its DescribeTable output.
+
+    Covers the keys, indexes (global and local), billing, streams,
+    encryption and table class. Tags, TTL and point-in-time recovery are
+    not part of DescribeTable; _recreate_table copies those separately.
+    """
+    on_demand = table.get("BillingModeSummary", {}).get("BillingMode") == "PAY_PER_REQUEST"
+
+    def capacity(description: Dict) -> Dict:
+        if on_demand:
+            return {}
+        throughput = description["ProvisionedThroughput"]
+        return {"ProvisionedThroughput": {
+            "ReadCapacityUnits": throughput["ReadCapacityUnits"],
+            "WriteCapacityUnits": throughput["WriteCapacityUnits"],
+        }}
+
+    request: Dict = {
+        "TableName": table["TableName"],
+        "KeySchema": table["KeySchema"],
+        "AttributeDefinitions": table["AttributeDefinitions"],
+        **capacity(table),
+    }
+    if on_demand:
+        request["BillingMode"] = "PAY_PER_REQUEST"
+    if table.get("GlobalSecondaryIndexes"):
+        request["GlobalSecondaryIndexes"] = [
+            {
+                "IndexName": index["IndexName"],
+                "KeySchema": index["KeySchema"],
+                "Projection": index["Projection"],
+                **capacity(index),
+            }
+            for index in table["GlobalSecondaryIndexes"]
+        ]
+    if table.get("LocalSecondaryIndexes"):
+        request["LocalSecondaryIndexes"] = [
+            {
+                "IndexName": index["IndexName"],
+                "KeySchema": index["KeySchema"],
+                "Projection": index["Projection"],
+            }
+            for index in table["LocalSecondaryIndexes"]
+        ]
+    stream = table.get("StreamSpecification")
+    if stream and stream.get("StreamEnabled"):
+        request["StreamSpecification"] = stream
+    sse = table.get("SSEDescription")
+    if sse and sse.get("Status") in ("ENABLED", "ENABLING"):
+        request["SSESpecification"] = {"Enabled": True, "SSEType": sse["SSEType"]}
+        if sse.get("KMSMasterKeyArn"):
+            request["SSESpecification"]["KMSMasterKeyId"] = sse["KMSMasterKeyArn"]
+    table_class = table.get("TableClassSummary", {}).get("TableClass")
+    if table_class:
+        request["TableClass"] = table_class
+    return request
+
+
+def _table_tags(client, table_arn: str) -> List[Dict]:
+    """Every tag on the table, following NextToken."""
+    tags: List[Dict] = []
+    kwargs = {"ResourceArn": table_arn}
+    while True:
+        response = client.list_tags_of_resource(**kwargs)
+        tags.extend(response.get("Tags", []))
+        if "NextToken" not in response:
+            return tags
+        kwargs["NextToken"] = response["NextToken"]
+
+
+def _recreate_table() -> None:
+    """Drop the table and create it again with the same settings.
+
+    Everything is read before the delete, from a fresh DescribeTable rather
+    than the cached one, and the cache is dropped afterwards because the new
+    table has a new ARN and creation time.
+    """
+    client = _get_client()
+    table = client.describe_table(TableName=TABLE_NAME)["Table"]
+    request = _create_table_request(table)
+    tags = _table_tags(client, table["TableArn"])
+    if tags:
+        request["Tags"] = tags
+    ttl = client.describe_time_to_live(TableName=TABLE_NAME)["TimeToLiveDescription"]
+    backups = client.describe_continuous_backups(TableName=TABLE_NAME)["ContinuousBackupsDescription"]
+    pitr = backups.get("PointInTimeRecoveryDescription", {}).get("PointInTimeRecoveryStatus") == "ENABLED"
+
+    client.delete_table(TableName=TABLE_NAME)
+    client.get_waiter("table_not_exists").wait(TableName=TABLE_NAME)
+    client.create_table(**request)
+    client.get_waiter("table_exists").wait(TableName=TABLE_NAME)
+    _describe_table.cache_clear()
+
+    if ttl.get("TimeToLiveStatus") in ("ENABLED", "ENABLING"):
+        client.update_time_to_live(
+            TableName=TABLE_NAME,
+            TimeToLiveSpecification={"Enabled": True, "AttributeName": ttl["AttributeName"]},
+        )
+    if pitr:
+        client.update_continuous_backups(
+            TableName=TABLE_NAME,
+            PointInTimeRecoverySpecification={"PointInTimeRecoveryEnabled": True},
+        )
+
+
+def count_artifacts(queries: Iterable[ArtifactQuery]) -> int:
+    """Count the artifacts query_artifacts would return, across all pages.
+
+    When every query is "*", a Select=COUNT scan filtered by type returns
+    only counts, no item bodies. Name queries are counted from their
+    (already narrow) index lookups.
+    """
+    wanted = _compile_queries(queries)
+    if any(names is not None for names in wanted.values()):
+        count, token = 0, None
+        while True:
+            page, token = query_artifacts(queries, offset_token=token)
+            count += len(page)
+            if token is None:
+                return count
+
+    if not wanted:
+        return 0
+    client = _get_client()
+    types = {f"t{i}": artifact_type for i, artifact_type in enumerate(wanted)}
+    scan_kwargs: Dict = {
+        "TableName": TABLE_NAME,
+        "Select": "COUNT",
+        "FilterExpression": f"artifact_type IN ({', '.join(':' + name for name in types)})",
+        "ExpressionAttributeValues": _values(**types),
+    }
+    count = 0
+    try:
+        while True:
+            response = client.scan(**scan_kwargs)
+            count += response["Count"]
+            if "LastEvaluatedKey" not in response:
+                return count
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ResourceNotFoundException":
+            raise RuntimeError(f"DynamoDB table {TABLE_NAME} not found") from e
+        raise
 
 
 def reset() -> None:
-    """Reset the registry by deleting all items."""
-    items = _scan_table()
-    for item in items:
-        artifact_id = item.get("artifact_id", {}).get("S")
-        if artifact_id:
-            _delete_item(artifact_id)
+    """Reset the registry by deleting all items.
+
+    With DDB_ALLOW_TABLE_RECREATE set, the table is dropped and recreated
+    instead, which takes the same time however many items it holds.
+    """
+    if ALLOW_TABLE_RECREATE:
+        _recreate_table()
+        reset_cache()
+        return
+
+    items = _scan_table(ProjectionExpression="artifact_id")
+    _batch_write([
+        {"DeleteRequest": {"Key": _key(item["artifact_id"])}}
+        for item in items
+        if item.get("artifact_id")
+    ])
+    reset_cache()
 
 
 # ---------------------------------------------------------------------------
@@ -431,8 +1133,23 @@ def reset() -> None:
 # ---------------------------------------------------------------------------
 
 def artifact_exists(artifact_type: ArtifactType, url: str) -> bool:
-    """Check if an artifact exists by URL."""
-    return _find_by_url(artifact_type, url) is not None
+    """Check if an artifact exists by URL.
+
+    Select=COUNT returns no item attributes at all, only the match count;
+    Limit=1 stops the index read at the first match.
+    """
+    if not url:
+        return False
+
+    response = _query(
+        IndexName=URL_INDEX,
+        KeyConditionExpression="artifact_type = :t AND #u = :u",
+        ExpressionAttributeNames={"#u": "url"},
+        ExpressionAttributeValues=_values(t=artifact_type.value, u=_index_key(url)),
+        Select="COUNT",
+        Limit=1,
+    )
+    return response.get("Count", 0) > 0
 
 
 def save_model_rating(artifact_id: ArtifactID, rating: ModelRating) -> None:
@@ -441,50 +1158,81 @@ def save_model_rating(artifact_id: ArtifactID, rating: ModelRating) -> None:
     if not item:
         return
     
-    stored_type = item.get("artifact_type", {}).get("S", "")
-    if stored_type != ArtifactType.MODEL.value:
+    stored_type = item.get("artifact_type")
+    if stored_type != _MODEL_T:
         return
     
-    rating_dict = _serialize_rating(rating)
-    item["rating"] = {"S": json.dumps(rating_dict)}
+    item["rating"] = _encode_rating(rating)
+    item["cost"] = Decimal(str(rating_cost(rating)))
+    item.pop("content_hash", None)
     _put_item(item)
+    _invalidate(artifact_id)
 
 
 def get_model_rating(artifact_id: ArtifactID) -> Optional[ModelRating]:
     """Get a model rating."""
+    rating = _cache_get(_RATING_CACHE, artifact_id)
+    if rating is not None:
+        return rating
+
     item = _get_item(artifact_id)
     if not item:
         return None
     
-    stored_type = item.get("artifact_type", {}).get("S", "")
-    if stored_type != ArtifactType.MODEL.value:
+    stored_type = item.get("artifact_type")
+    if stored_type != _MODEL_T:
         return None
     
-    return _deserialize_rating(item)
+    rating = _deserialize_rating(item)
+    if rating is not None:
+        _cache_put(_RATING_CACHE, artifact_id, rating)
+    return rating
+
+
+def get_model_cost(artifact_id: ArtifactID) -> Optional[float]:
+    """Get a model's cost, precomputed from its rating when it was saved."""
+    item = _get_item(artifact_id)
+    if not item:
+        return None
+
+    stored_type = item.get("artifact_type")
+    if stored_type != _MODEL_T:
+        return None
+
+    if "cost" in item:
+        return float(item["cost"])
+
+    # Items rated before the cost attribute existed
+    rating = _deserialize_rating(item)
+    return rating_cost(rating) if rating else None
 
 
 def find_dataset_by_name(name: str) -> Optional[DatasetRecord]:
     """Find a dataset by normalized name."""
-    normalized = _normalized(name)
-    items = _scan_table()
-    for item in items:
-        stored_type = item.get("artifact_type", {}).get("S", "")
-        if stored_type == ArtifactType.DATASET.value:
-            artifact = _deserialize_artifact(item)
-            if _normalized(artifact.metadata.name) == normalized:
-                return DatasetRecord(artifact=artifact)
-    return None
+    artifact = _find_by_name(ArtifactType.DATASET, name)
+    return DatasetRecord(artifact=artifact) if artifact else None
 
 
 def find_code_by_name(name: str) -> Optional[CodeRecord]:
     """Find code by normalized name."""
-    normalized = _normalized(name)
-    items = _scan_table()
-    for item in items:
-        stored_type = item.get("artifact_type", {}).get("S", "")
-        if stored_type == ArtifactType.CODE.value:
-            artifact = _deserialize_artifact(item)
-            if _normalized(artifact.metadata.name) == normalized:
-                return CodeRecord(artifact=artifact)
-    return None
+    artifact = _find_by_name(ArtifactType.CODE, name)
+    return CodeRecord(artifact=artifact) if artifact else None
+
+
+def find_linked_artifacts(
+    dataset_name: Optional[str],
+    code_name: Optional[str],
+) -> Tuple[Optional[DatasetRecord], Optional[CodeRecord]]:
+    """Find a dataset and a code artifact by normalized name.
+
+    When both names are given, the two index lookups run concurrently, so
+    the call costs one round-trip instead of two.
+    """
+    if not (dataset_name and code_name):
+        dataset_record = find_dataset_by_name(dataset_name) if dataset_name else None
+        code_record = find_code_by_name(code_name) if code_name else None
+        return dataset_record, code_record
 
+    dataset_future = _LOOKUP_EXECUTOR.submit(find_dataset_by_name, dataset_name)
+    code_record = find_code_by_name(code_name)
+    return dataset_future.result(), code_record
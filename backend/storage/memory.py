@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import uuid
-from typing import Dict, Iterable, List, Optional, cast
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from backend.models import (Artifact, ArtifactID, ArtifactMetadata,
                             ArtifactQuery, ArtifactType, ModelRating)
-from backend.storage.records import CodeRecord, DatasetRecord, ModelRecord
+from backend.storage.records import (CodeRecord, DatasetRecord, ModelRecord,
+                                     decode_page_token, encode_page_token,
+                                     normalize_name, rating_cost)
 
 # ---------------------------------------------------------------------------
 # In-memory stores separated by artifaact typee
@@ -15,19 +17,31 @@ _MODELS: Dict[ArtifactID, ModelRecord] = {}
 _DATASETS: Dict[ArtifactID, DatasetRecord] = {}
 _CODES: Dict[ArtifactID, CodeRecord] = {}
 
-_TYPE_TO_STORE = {
+_TYPE_TO_STORE: Dict[ArtifactType, Dict[ArtifactID, Any]] = {
     ArtifactType.MODEL: _MODELS,
     ArtifactType.DATASET: _DATASETS,
     ArtifactType.CODE: _CODES,
 }
 
+# Secondary indexes by normalized name. Each value is an insertion-ordered
+# set of ids (a dict with None values), so lookups keep first-saved-wins order.
+_DATASET_BY_NAME: Dict[str, Dict[ArtifactID, None]] = {}
+_CODE_BY_NAME: Dict[str, Dict[ArtifactID, None]] = {}
+# Models by the dataset/code name they reference, for the reverse fan-out
+_MODELS_BY_DATASET_NAME: Dict[str, Dict[ArtifactID, None]] = {}
+_MODELS_BY_CODE_NAME: Dict[str, Dict[ArtifactID, None]] = {}
+
+_INDEXES = (_DATASET_BY_NAME, _CODE_BY_NAME, _MODELS_BY_DATASET_NAME, _MODELS_BY_CODE_NAME)
+
+QUERY_PAGE_SIZE = 100
+
 
 # ---------------------------------------------------------------------------
 # Internal utilities
 # ---------------------------------------------------------------------------
 
 def generate_artifact_id() -> ArtifactID:
-    return str(uuid.uuid4())
+    return uuid.uuid4().hex
 
 
 def _get_store(artifact_type: ArtifactType):
@@ -42,26 +56,51 @@ def _find_by_url(artifact_type: ArtifactType, url: str) -> Optional[ArtifactID]:
     return None
 
 
-def _normalized(name: Optional[str]) -> Optional[str]:
-    return name.strip().lower() if isinstance(name, str) else None
+_normalized = normalize_name
+
+
+def _index_add(index: Dict[str, Dict[ArtifactID, None]], name: Optional[str], artifact_id: ArtifactID) -> None:
+    if name:
+        index.setdefault(name, {})[artifact_id] = None
+
+
+def _index_discard(index: Dict[str, Dict[ArtifactID, None]], name: Optional[str], artifact_id: ArtifactID) -> None:
+    if not name or name not in index:
+        return
+    ids = index[name]
+    ids.pop(artifact_id, None)
+    if not ids:
+        del index[name]
+
+
+def _reindex(
+    index: Dict[str, Dict[ArtifactID, None]],
+    old_name: Optional[str],
+    new_name: Optional[str],
+    artifact_id: ArtifactID,
+) -> None:
+    if old_name != new_name:
+        _index_discard(index, old_name, artifact_id)
+        _index_add(index, new_name, artifact_id)
+
+
+def _first_by_name(index: Dict[str, Dict[ArtifactID, None]], name: Optional[str]) -> Optional[ArtifactID]:
+    ids = index.get(name) if name else None
+    return next(iter(ids)) if ids else None
 
 
 def _link_dataset_code(model_record: ModelRecord) -> None:
-    dataset_name = _normalized(model_record.dataset_name)
-    if model_record.dataset_id is None and dataset_name:
-        for dataset_id, dataset_record in _DATASETS.items():
-            if _normalized(dataset_record.artifact.metadata.name) == dataset_name:
-                model_record.dataset_id = dataset_id
-                model_record.dataset_url = dataset_record.artifact.data.url
-                break
-
-    code_name = _normalized(model_record.code_name)
-    if model_record.code_id is None and code_name:
-        for code_id, code_record in _CODES.items():
-            if _normalized(code_record.artifact.metadata.name) == code_name:
-                model_record.code_id = code_id
-                model_record.code_url = code_record.artifact.data.url
-                break
+    if model_record.dataset_id is None:
+        dataset_id = _first_by_name(_DATASET_BY_NAME, _normalized(model_record.dataset_name))
+        if dataset_id:
+            model_record.dataset_id = dataset_id
+            model_record.dataset_url = _DATASETS[dataset_id].artifact.data.url
+
+    if model_record.code_id is None:
+        code_id = _first_by_name(_CODE_BY_NAME, _normalized(model_record.code_name))
+        if code_id:
+            model_record.code_id = code_id
+            model_record.code_url = _CODES[code_id].artifact.data.url
 
 
 # ---------------------------------------------------------------------------
@@ -81,8 +120,11 @@ def save_artifact(
     """Insert or update an artifact entry in the appropriate store."""
     if artifact.metadata.type == ArtifactType.MODEL:
         record = _MODELS.get(artifact.metadata.id)
+        old_dataset_name = _normalized(record.dataset_name) if record else None
+        old_code_name = _normalized(record.code_name) if record else None
         if record:
             record.artifact = artifact
+            record.name_normalized = _normalized(artifact.metadata.name)
             record.rating = rating or record.rating
             record.dataset_name = dataset_name or record.dataset_name
             record.dataset_url = dataset_url or record.dataset_url
@@ -98,19 +140,27 @@ def save_artifact(
                 code_url=code_url,
             )
             _MODELS[artifact.metadata.id] = record
+        _reindex(_MODELS_BY_DATASET_NAME, old_dataset_name, _normalized(record.dataset_name), artifact.metadata.id)
+        _reindex(_MODELS_BY_CODE_NAME, old_code_name, _normalized(record.code_name), artifact.metadata.id)
         _link_dataset_code(record)
     elif artifact.metadata.type == ArtifactType.DATASET:
-        _DATASETS[artifact.metadata.id] = DatasetRecord(artifact=artifact)
-        dataset_name_normalized = _normalized(artifact.metadata.name)
-        for model_record in _MODELS.values():
-            if model_record.dataset_id is None and _normalized(model_record.dataset_name) == dataset_name_normalized:
+        previous = _DATASETS.get(artifact.metadata.id)
+        dataset_record = _DATASETS[artifact.metadata.id] = DatasetRecord(artifact=artifact)
+        old_name = previous.name_normalized if previous else None
+        _reindex(_DATASET_BY_NAME, old_name, dataset_record.name_normalized, artifact.metadata.id)
+        for model_id in _MODELS_BY_DATASET_NAME.get(dataset_record.name_normalized or "", ()):
+            model_record = _MODELS[model_id]
+            if model_record.dataset_id is None:
                 model_record.dataset_id = artifact.metadata.id
                 model_record.dataset_url = artifact.data.url
     elif artifact.metadata.type == ArtifactType.CODE:
-        _CODES[artifact.metadata.id] = CodeRecord(artifact=artifact)
-        code_name_normalized = _normalized(artifact.metadata.name)
-        for model_record in _MODELS.values():
-            if model_record.code_id is None and _normalized(model_record.code_name) == code_name_normalized:
+        previous_code = _CODES.get(artifact.metadata.id)
+        code_record = _CODES[artifact.metadata.id] = CodeRecord(artifact=artifact)
+        old_name = previous_code.name_normalized if previous_code else None
+        _reindex(_CODE_BY_NAME, old_name, code_record.name_normalized, artifact.metadata.id)
+        for model_id in _MODELS_BY_CODE_NAME.get(code_record.name_normalized or "", ()):
+            model_record = _MODELS[model_id]
+            if model_record.code_id is None:
                 model_record.code_id = artifact.metadata.id
                 model_record.code_url = artifact.data.url
     else:
@@ -118,6 +168,10 @@ def save_artifact(
     return artifact
 
 
+def save_artifacts_batch(artifacts: Iterable[Artifact]) -> List[Artifact]:
+    return [save_artifact(artifact) for artifact in artifacts]
+
+
 def get_artifact(artifact_type: ArtifactType, artifact_id: ArtifactID) -> Optional[Artifact]:
     record = _get_store(artifact_type).get(artifact_id)
     if not record:
@@ -125,49 +179,90 @@ def get_artifact(artifact_type: ArtifactType, artifact_id: ArtifactID) -> Option
     return record.artifact
 
 
-def delete_artifact(artifact_type: ArtifactType, artifact_id: ArtifactID) -> bool:
+def delete_artifact(artifact_type: ArtifactType, artifact_id: ArtifactID) -> Optional[Artifact]:
     store = _get_store(artifact_type)
     if artifact_id not in store:
-        return False
+        return None
 
-    if artifact_type == ArtifactType.DATASET:
+    if artifact_type == ArtifactType.MODEL:
+        _index_discard(_MODELS_BY_DATASET_NAME, _normalized(_MODELS[artifact_id].dataset_name), artifact_id)
+        _index_discard(_MODELS_BY_CODE_NAME, _normalized(_MODELS[artifact_id].code_name), artifact_id)
+    elif artifact_type == ArtifactType.DATASET:
+        _index_discard(_DATASET_BY_NAME, _DATASETS[artifact_id].name_normalized, artifact_id)
         for model_record in _MODELS.values():
             if model_record.dataset_id == artifact_id:
                 model_record.dataset_id = None
                 model_record.dataset_url = None
     elif artifact_type == ArtifactType.CODE:
+        _index_discard(_CODE_BY_NAME, _CODES[artifact_id].name_normalized, artifact_id)
         for model_record in _MODELS.values():
             if model_record.code_id == artifact_id:
                 model_record.code_id = None
                 model_record.code_url = None
 
-    del store[artifact_id]
-    return True
+    return store.pop(artifact_id).artifact
 
 
 def list_metadata(artifact_type: ArtifactType) -> List[ArtifactMetadata]:
     return [record.artifact.metadata for record in _get_store(artifact_type).values()]
 
 
-def query_artifacts(queries: Iterable[ArtifactQuery]) -> List[ArtifactMetadata]:
-    results: Dict[str, ArtifactMetadata] = {}
+def _matching(queries: Iterable[ArtifactQuery]) -> List[ArtifactMetadata]:
+    # Lowercased names wanted per type; None when a "*" query matches all
+    wanted: Dict[ArtifactType, Optional[Set[str]]] = {}
     for query in queries:
-        types = query.types or list(_TYPE_TO_STORE.keys())
-        for artifact_type in types:
-            for record in _get_store(artifact_type).values():
-                metadata = record.artifact.metadata
+        for artifact_type in query.types or list(_TYPE_TO_STORE.keys()):
+            if query.name == "*":
+                wanted[artifact_type] = None
+                continue
+            names = wanted.setdefault(artifact_type, set())
+            if names is not None:
+                names.add(query.name.lower())
+
+    results: List[ArtifactMetadata] = []
+    for artifact_type, names in wanted.items():
+        for record in _get_store(artifact_type).values():
+            metadata = record.artifact.metadata
+            # FIX: exact match except "*"
+            if names is None or metadata.name.lower() in names:
+                results.append(metadata)
+    return results
+
+
+def query_artifacts(
+    queries: Iterable[ArtifactQuery],
+    *,
+    offset_token: Optional[str] = None,
+    limit: int = QUERY_PAGE_SIZE,
+) -> Tuple[List[ArtifactMetadata], Optional[str]]:
+    # Same token format and id order as the DynamoDB backend
+    last_id = decode_page_token(offset_token) if offset_token else None
+    results = sorted(_matching(queries), key=lambda metadata: metadata.id)
+    if last_id is not None:
+        results = [metadata for metadata in results if metadata.id > last_id]
+    page = results[:limit]
+    return page, encode_page_token(page[-1].id) if len(results) > limit else None
+
+
+def count_artifacts(queries: Iterable[ArtifactQuery]) -> int:
+    return len(_matching(queries))
 
-                # FIX: exact match except "*"
-                if query.name == "*" or query.name.lower() == metadata.name.lower():
-                    results[f"{metadata.type}:{metadata.id}"] = metadata
 
-    return list(results.values())
+def reset_cache() -> None:
+    # Nothing sits in front of the in-memory stores
+    return None
+
+
+def warm_up() -> None:
+    # No connection to open
+    return None
 
 
 def reset() -> None:
     for store in _TYPE_TO_STORE.values():
-        store = cast(dict[ArtifactID, object], store)
         store.clear()
+    for index in _INDEXES:
+        index.clear()
 
 
 # ---------------------------------------------------------------------------
@@ -191,17 +286,27 @@ def get_model_rating(artifact_id: ArtifactID) -> Optional[ModelRating]:
     return record.rating
 
 
+def get_model_cost(artifact_id: ArtifactID) -> Optional[float]:
+    record = _MODELS.get(artifact_id)
+    if not record or not record.rating:
+        return None
+    return rating_cost(record.rating)
+
+
 def find_dataset_by_name(name: str) -> Optional[DatasetRecord]:
-    normalized = _normalized(name)
-    for record in _DATASETS.values():
-        if _normalized(record.artifact.metadata.name) == normalized:
-            return record
-    return None
+    dataset_id = _first_by_name(_DATASET_BY_NAME, _normalized(name))
+    return _DATASETS[dataset_id] if dataset_id else None
 
 
 def find_code_by_name(name: str) -> Optional[CodeRecord]:
-    normalized = _normalized(name)
-    for record in _CODES.values():
-        if _normalized(record.artifact.metadata.name) == normalized:
-            return record
-    return None
+    code_id = _first_by_name(_CODE_BY_NAME, _normalized(name))
+    return _CODES[code_id] if code_id else None
+
+
+def find_linked_artifacts(
+    dataset_name: Optional[str],
+    code_name: Optional[str],
+) -> Tuple[Optional[DatasetRecord], Optional[CodeRecord]]:
+    dataset_record = find_dataset_by_name(dataset_name) if dataset_name else None
+    code_record = find_code_by_name(code_name) if code_name else None
+    return dataset_record, code_record
@@ -1,10 +1,47 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import base64
+import binascii
+import re
+from dataclasses import dataclass, field
 from typing import Optional
 
 from backend.models import Artifact, ArtifactID, ModelRating
 
+# Page tokens are the id of the last artifact on the previous page, encoded
+# with a version marker so other strings (e.g. old integer offsets) are rejected
+_PAGE_TOKEN_PREFIX = "p1."
+_TOKEN_ID_RE = re.compile(r"^[a-zA-Z0-9\-]+$")
+
+
+class InvalidPageToken(Exception):
+    """A pagination token that no previous page could have returned."""
+
+
+def normalize_name(name: Optional[str]) -> Optional[str]:
+    """Normalize a name for comparison."""
+    return name.strip().lower() if isinstance(name, str) else None
+
+
+def encode_page_token(last_id: ArtifactID) -> str:
+    """Opaque token for the page that follows the artifact ``last_id``."""
+    encoded = base64.urlsafe_b64encode(last_id.encode()).rstrip(b"=").decode()
+    return _PAGE_TOKEN_PREFIX + encoded
+
+
+def decode_page_token(token: str) -> ArtifactID:
+    """Inverse of encode_page_token; raises InvalidPageToken for anything else."""
+    if not token.startswith(_PAGE_TOKEN_PREFIX):
+        raise InvalidPageToken("Invalid pagination offset")
+    encoded = token[len(_PAGE_TOKEN_PREFIX):]
+    try:
+        last_id = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise InvalidPageToken("Invalid pagination offset") from e
+    if not _TOKEN_ID_RE.fullmatch(last_id):
+        raise InvalidPageToken("Invalid pagination offset")
+    return last_id
+
 
 @dataclass
 class ModelRecord:
@@ -16,13 +53,30 @@ class ModelRecord:
     code_name: Optional[str] = None
     code_url: Optional[str] = None
     rating: Optional[ModelRating] = None
+    name_normalized: Optional[str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.name_normalized = normalize_name(self.artifact.metadata.name)
 
 
 @dataclass
 class DatasetRecord:
     artifact: Artifact
+    name_normalized: Optional[str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.name_normalized = normalize_name(self.artifact.metadata.name)
 
 
 @dataclass
 class CodeRecord:
     artifact: Artifact
+    name_normalized: Optional[str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.name_normalized = normalize_name(self.artifact.metadata.name)
+
+
+def rating_cost(rating: ModelRating) -> float:
+    """Derive a model's cost (MB-equivalent) from its Raspberry Pi size score."""
+    return max(0.0, round((1.0 - rating.size_score.raspberry_pi) * 1000, 1))
@@ -6,52 +6,175 @@ or inside a container. It can be used to verify that the storage layer
 is working correctly.
 
 Usage:
-    # Set environment variables
-    export DDB_TABLE_NAME=artifacts_metadata
+    # Set environment variables. test_reset wipes the table, so point
+    # DDB_TABLE_NAME at a test table; the script will not run without it
+    # unless DDB_LOCAL is set
+    export DDB_TABLE_NAME=artifacts_metadata_test
     export AWS_REGION=us-east-2
     
-    # Run the test
+    # Run the test (LOGLEVEL=DEBUG for section rules, WARNING for errors only)
     python scripts/test_dynamodb.py
+
+    # Or against DynamoDB Local (see DYNAMODB_MIGRATION.md); the table is
+    # created on first run
+    DDB_LOCAL=1 python scripts/test_dynamodb.py
 """
 
+import asyncio
+import functools
+import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import boto3
+
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from backend.models import Artifact, ArtifactData, ArtifactMetadata, ArtifactType
+# Set environment variables if not already set. This must run before the
+# backend imports: the storage module reads its configuration at import time.
+# Against AWS, the table must be named explicitly, since test_reset wipes it;
+# only DynamoDB Local falls back to the default name.
+USE_LOCAL = os.getenv("DDB_LOCAL", "").lower() in ("1", "true", "yes")
+TABLE_CONFIGURED = bool(os.getenv("DDB_TABLE_NAME"))
+os.environ.setdefault("DDB_TABLE_NAME", "artifacts_metadata")
+os.environ.setdefault("AWS_REGION", "us-east-2")
+# With DDB_LOCAL, default to a DynamoDB Local container instead of real AWS
+# (CI=true alone, as CI runners set it, still targets the real table). It
+# accepts any credentials, but boto3 still needs some to sign requests.
+if USE_LOCAL:
+    os.environ.setdefault("DDB_ENDPOINT_URL", "http://localhost:8000")
+    if os.environ["DDB_ENDPOINT_URL"].startswith("http://localhost"):
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "local")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "local")
+
+from backend.models import (Artifact, ArtifactData, ArtifactMetadata, ArtifactQuery,
+                            ArtifactType, ModelRating, SizeScore)
 from backend.storage import (
     artifact_exists,
+    count_artifacts,
     delete_artifact,
     generate_artifact_id,
     get_artifact,
+    get_model_rating,
     query_artifacts,
     reset,
+    reset_cache,
     save_artifact,
+    save_artifacts_batch,
+    warm_up,
 )
+from backend.storage.dynamodb import TABLE_SCHEMA
 
-# Set environment variables if not already set
-os.environ.setdefault("DDB_TABLE_NAME", "artifacts_metadata")
-os.environ.setdefault("AWS_REGION", "us-east-2")
+# A standalone script (run it with python, see above): test_reset wipes the
+# table, and the tests depend on running in main()'s order, so pytest must
+# not collect this module
+__test__ = False
+
+# LOGLEVEL=WARNING quiets the progress lines; DEBUG adds the banner rules.
+# Only this script's logger is raised, so boto3 stays at WARNING.
+logging.basicConfig(format="%(message)s")
+log = logging.getLogger("ddbtest")
+log.setLevel(os.getenv("LOGLEVEL", "INFO").upper())
+
+
+# Code artifact test_reset copies, replacing only name, id and url
+_TEMPLATE_ARTIFACT = Artifact(
+    metadata=ArtifactMetadata(name="template", id="template", type=ArtifactType.CODE),
+    data=ArtifactData(url="https://example.com/template"),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _template_rating() -> ModelRating:
+    """Rating shared by the tests, built (and validated) on first use only.
+
+    Tests copy it with model_copy instead of re-running validation.
+    """
+    return ModelRating(
+        name="test-model",
+        category="MODEL",
+        net_score=0.85,
+        net_score_latency=0.0,
+        ramp_up_time=0.8,
+        ramp_up_time_latency=0.0,
+        bus_factor=0.9,
+        bus_factor_latency=0.0,
+        performance_claims=0.7,
+        performance_claims_latency=0.0,
+        license=1.0,
+        license_latency=0.0,
+        dataset_and_code_score=0.75,
+        dataset_and_code_score_latency=0.0,
+        dataset_quality=0.8,
+        dataset_quality_latency=0.0,
+        code_quality=0.85,
+        code_quality_latency=0.0,
+        reproducibility=0.9,
+        reproducibility_latency=0.0,
+        reviewedness=0.75,
+        reviewedness_latency=0.0,
+        tree_score=0.8,
+        tree_score_latency=0.0,
+        size_score=SizeScore(
+            raspberry_pi=0.5,
+            jetson_nano=0.6,
+            desktop_pc=0.8,
+            aws_server=0.9,
+        ),
+        size_score_latency=0.0,
+    )
+
+
+def _ensure_local_table() -> None:
+    """Create the table and its indexes on a local endpoint if it is missing.
+
+    Only runs when DDB_ENDPOINT_URL points at localhost (DynamoDB Local); the
+    real table is managed outside this script (see DYNAMODB_MIGRATION.md).
+    """
+    endpoint = os.getenv("DDB_ENDPOINT_URL", "")
+    if not endpoint.startswith("http://localhost"):
+        return
+
+    client = boto3.client("dynamodb", region_name=os.environ["AWS_REGION"], endpoint_url=endpoint)
+    table_name = os.environ["DDB_TABLE_NAME"]
+    if table_name in client.list_tables()["TableNames"]:
+        return
+
+    client.create_table(TableName=table_name, **TABLE_SCHEMA)
+    client.get_waiter("table_exists").wait(TableName=table_name)
+    log.info("Created table %s on %s", table_name, endpoint)
+
+
+def _banner(title: str) -> None:
+    """Log a section title, framed by rules at DEBUG level."""
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("=" * 60)
+    log.info(title)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("=" * 60)
+
+
+async def _concurrently(*calls):
+    """Run blocking storage calls on worker threads and gather their results."""
+    return await asyncio.gather(*(asyncio.to_thread(call) for call in calls))
 
 
 def test_basic_operations():
     """Test basic CRUD operations."""
-    print("=" * 60)
-    print("Testing Basic DynamoDB Operations")
-    print("=" * 60)
+    _banner("Testing Basic DynamoDB Operations")
     
     # Test 1: Generate artifact ID
-    print("\n1. Testing generate_artifact_id()...")
+    log.info("1. Testing generate_artifact_id()...")
     artifact_id = generate_artifact_id()
-    print(f"   Generated ID: {artifact_id}")
+    log.info("   Generated ID: %s", artifact_id)
     assert artifact_id, "Failed to generate artifact ID"
     
     # Test 2: Create a dataset artifact
-    print("\n2. Testing save_artifact() for dataset...")
+    log.info("2. Testing save_artifact() for dataset...")
     dataset_artifact = Artifact(
         metadata=ArtifactMetadata(
             name="test-dataset",
@@ -60,52 +183,51 @@ def test_basic_operations():
         ),
         data=ArtifactData(url="https://huggingface.co/datasets/test-dataset"),
     )
+    # What was stored is checked by reading it back below
     save_artifact(dataset_artifact)
-    print(f"   Saved dataset: {dataset_artifact.metadata.id}")
+    log.info("   Saved dataset: %s", dataset_artifact.metadata.id)
+    
+    # Read back from DynamoDB, not from what save_artifact cached, so the
+    # item round-trip and deserialization are what gets checked
+    reset_cache()
+    # Tests 3-5 only read the saved artifact, so they run concurrently
+    queries = [ArtifactQuery(name="test-dataset", types=[ArtifactType.DATASET])]
+    retrieved, exists, (results, _) = asyncio.run(_concurrently(
+        lambda: get_artifact(ArtifactType.DATASET, dataset_artifact.metadata.id),
+        lambda: artifact_exists(ArtifactType.DATASET, dataset_artifact.data.url),
+        lambda: query_artifacts(queries),
+    ))
     
     # Test 3: Retrieve the artifact
-    print("\n3. Testing get_artifact()...")
-    retrieved = get_artifact(ArtifactType.DATASET, dataset_artifact.metadata.id)
+    log.info("3. Testing get_artifact()...")
     assert retrieved is not None, "Failed to retrieve artifact"
     assert retrieved.metadata.name == "test-dataset", "Name mismatch"
-    print(f"   Retrieved artifact: {retrieved.metadata.name}")
+    log.info("   Retrieved artifact: %s", retrieved.metadata.name)
     
     # Test 4: Check if artifact exists
-    print("\n4. Testing artifact_exists()...")
-    exists = artifact_exists(ArtifactType.DATASET, dataset_artifact.data.url)
+    log.info("4. Testing artifact_exists()...")
     assert exists, "Artifact should exist"
-    print(f"   Artifact exists: {exists}")
+    log.info("   Artifact exists: %s", exists)
     
     # Test 5: Query artifacts
-    print("\n5. Testing query_artifacts()...")
-    from backend.models import ArtifactQuery
-    
-    queries = [ArtifactQuery(name="test-dataset", types=[ArtifactType.DATASET])]
-    results = query_artifacts(queries)
+    log.info("5. Testing query_artifacts()...")
     assert len(results) > 0, "Query should return results"
-    print(f"   Query returned {len(results)} result(s)")
+    log.info("   Query returned %s result(s)", len(results))
     
     # Test 6: Delete artifact
-    print("\n6. Testing delete_artifact()...")
+    log.info("6. Testing delete_artifact()...")
+    # The deleted item comes back from the same request, so no follow-up read
     deleted = delete_artifact(ArtifactType.DATASET, dataset_artifact.metadata.id)
-    assert deleted, "Failed to delete artifact"
-    print(f"   Deleted artifact: {deleted}")
-    
-    # Verify deletion
-    retrieved_after_delete = get_artifact(ArtifactType.DATASET, dataset_artifact.metadata.id)
-    assert retrieved_after_delete is None, "Artifact should be deleted"
-    print("   Verification: Artifact no longer exists")
+    assert deleted is not None, "Failed to delete artifact"
+    assert deleted.metadata.id == dataset_artifact.metadata.id, "Deleted the wrong artifact"
+    log.info("   Deleted artifact: %s", deleted.metadata.id)
     
-    print("\n✅ All basic operations passed!")
+    log.info("✅ All basic operations passed!")
 
 
 def test_model_with_rating():
     """Test model artifact with rating."""
-    print("\n" + "=" * 60)
-    print("Testing Model Artifact with Rating")
-    print("=" * 60)
-    
-    from backend.models import ModelRating, SizeScore
+    _banner("Testing Model Artifact with Rating")
     
     # Create a model artifact
     model_id = generate_artifact_id()
@@ -118,110 +240,85 @@ def test_model_with_rating():
         data=ArtifactData(url="https://huggingface.co/test-model"),
     )
     
-    # Create a rating
-    rating = ModelRating(
-        name="test-model",
-        category="MODEL",
-        net_score=0.85,
-        net_score_latency=0.0,
-        ramp_up_time=0.8,
-        ramp_up_time_latency=0.0,
-        bus_factor=0.9,
-        bus_factor_latency=0.0,
-        performance_claims=0.7,
-        performance_claims_latency=0.0,
-        license=1.0,
-        license_latency=0.0,
-        dataset_and_code_score=0.75,
-        dataset_and_code_score_latency=0.0,
-        dataset_quality=0.8,
-        dataset_quality_latency=0.0,
-        code_quality=0.85,
-        code_quality_latency=0.0,
-        reproducibility=0.9,
-        reproducibility_latency=0.0,
-        reviewedness=0.75,
-        reviewedness_latency=0.0,
-        tree_score=0.8,
-        tree_score_latency=0.0,
-        size_score=SizeScore(
-            raspberry_pi=0.5,
-            jetson_nano=0.6,
-            desktop_pc=0.8,
-            aws_server=0.9,
-        ),
-        size_score_latency=0.0,
-    )
+    # Create a rating from the shared template
+    rating = _template_rating().model_copy(update={"name": "test-model"})
     
-    print("\n1. Saving model with rating...")
+    log.info("1. Saving model with rating...")
     save_artifact(model_artifact, rating=rating)
-    print(f"   Saved model: {model_id}")
-    
-    print("\n2. Retrieving model rating...")
-    from backend.storage import get_model_rating
+    log.info("   Saved model: %s", model_id)
     
+    log.info("2. Retrieving model rating...")
+    reset_cache()
     retrieved_rating = get_model_rating(model_id)
     assert retrieved_rating is not None, "Rating should exist"
     assert retrieved_rating.net_score == 0.85, "Rating mismatch"
-    print(f"   Retrieved rating with net_score: {retrieved_rating.net_score}")
+    log.info("   Retrieved rating with net_score: %s", retrieved_rating.net_score)
     
     # Cleanup
     delete_artifact(ArtifactType.MODEL, model_id)
-    print("\n✅ Model with rating test passed!")
+    log.info("✅ Model with rating test passed!")
 
 
 def test_reset():
     """Test reset functionality."""
-    print("\n" + "=" * 60)
-    print("Testing Reset Functionality")
-    print("=" * 60)
+    _banner("Testing Reset Functionality")
     
     # Create some test artifacts
-    print("\n1. Creating test artifacts...")
-    for i in range(3):
-        artifact = Artifact(
-            metadata=ArtifactMetadata(
-                name=f"test-artifact-{i}",
-                id=generate_artifact_id(),
-                type=ArtifactType.CODE,
+    log.info("1. Creating test artifacts...")
+    artifacts = [
+        _TEMPLATE_ARTIFACT.model_copy(update={
+            "metadata": _TEMPLATE_ARTIFACT.metadata.model_copy(
+                update={"name": f"test-artifact-{i}", "id": generate_artifact_id()}
             ),
-            data=ArtifactData(url=f"https://example.com/test-{i}"),
-        )
-        save_artifact(artifact)
+            "data": _TEMPLATE_ARTIFACT.data.model_copy(update={"url": f"https://example.com/test-{i}"}),
+        })
+        for i in range(3)
+    ]
+    save_artifacts_batch(artifacts)
     
-    print("   Created 3 test artifacts")
+    log.info("   Created 3 test artifacts")
     
     # Reset
-    print("\n2. Resetting registry...")
+    log.info("2. Resetting registry...")
     reset()
-    print("   Registry reset")
+    log.info("   Registry reset")
     
     # Verify all artifacts are gone
-    print("\n3. Verifying reset...")
-    from backend.models import ArtifactQuery
-    
+    log.info("3. Verifying reset...")
     queries = [ArtifactQuery(name="*", types=[ArtifactType.CODE])]
-    results = query_artifacts(queries)
-    print(f"   Remaining artifacts: {len(results)}")
+    # Only the count comes back, not the items
+    remaining = count_artifacts(queries)
+    assert remaining == 0, f"Reset left {remaining} artifact(s)"
+    log.info("   Remaining artifacts: %s", remaining)
     
-    print("\n✅ Reset test passed!")
+    log.info("✅ Reset test passed!")
 
 
 def main():
     """Run all tests."""
+    if not (USE_LOCAL or TABLE_CONFIGURED):
+        log.error(
+            "Refusing to run: test_reset would wipe the default table. "
+            "Set DDB_TABLE_NAME to a test table, or DDB_LOCAL=1 for DynamoDB Local."
+        )
+        return 2
     try:
-        test_basic_operations()
-        test_model_with_rating()
+        _ensure_local_table()
+        # Open the shared client's connection before the timed operations
+        warm_up()
+        # These two touch separate artifacts, so they share the pool; their
+        # output may interleave
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(test) for test in (test_basic_operations, test_model_with_rating)]
+            for future in as_completed(futures):
+                future.result()
+        # reset() wipes the whole table, so it runs only after the others finish
         test_reset()
         
-        print("\n" + "=" * 60)
-        print("✅ All tests passed!")
-        print("=" * 60)
+        _banner("✅ All tests passed!")
         return 0
     except Exception as e:
-        print(f"\n❌ Test failed with error: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ Test failed with error: %s", e)
         return 1
 
 
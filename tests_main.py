@@ -1182,3 +1182,275 @@ class Test_LoggingMiddleware(IsolatedAsyncioTestCase):
 
             assert result.status_code == 200
             assert mock_logger.info.called
+
+
+def _artifact(artifact_id, name, artifact_type, url=None):
+    from backend.models import Artifact, ArtifactData, ArtifactMetadata
+    return Artifact(
+        metadata=ArtifactMetadata(id=artifact_id, name=name, type=artifact_type),
+        data=ArtifactData(url=url or f"https://huggingface.co/{name}"),
+    )
+
+
+class Test_MemoryStorage:
+    def setup_method(self):
+        from backend.storage import memory
+        memory.reset()
+
+    def teardown_method(self):
+        from backend.storage import memory
+        memory.reset()
+
+    def test_query_matches_exact_names_and_wildcard(self):
+        from backend.models import ArtifactQuery, ArtifactType
+        from backend.storage import memory
+        memory.save_artifact(_artifact("m1", "BERT", ArtifactType.MODEL))
+        memory.save_artifact(_artifact("m2", "bert-large", ArtifactType.MODEL))
+        memory.save_artifact(_artifact("d1", "bert", ArtifactType.DATASET))
+
+        page, token = memory.query_artifacts([ArtifactQuery(name="bert", types=[ArtifactType.MODEL])])
+        assert [metadata.id for metadata in page] == ["m1"]
+        assert token is None
+        assert memory.count_artifacts([ArtifactQuery(name="bert")]) == 2
+        assert memory.count_artifacts([ArtifactQuery(name="*")]) == 3
+
+    def test_query_pages_by_token(self):
+        from backend.models import ArtifactQuery, ArtifactType
+        from backend.storage import memory
+        for i in range(5):
+            memory.save_artifact(_artifact(f"m{i}", f"model-{i}", ArtifactType.MODEL))
+
+        seen = []
+        token = None
+        while True:
+            page, token = memory.query_artifacts([ArtifactQuery(name="*")], offset_token=token, limit=2)
+            seen.extend(metadata.id for metadata in page)
+            if token is None:
+                break
+            assert len(page) == 2
+        assert seen == ["m0", "m1", "m2", "m3", "m4"]
+
+    def test_last_full_page_returns_no_token(self):
+        from backend.models import ArtifactQuery, ArtifactType
+        from backend.storage import memory
+        for i in range(4):
+            memory.save_artifact(_artifact(f"m{i}", f"model-{i}", ArtifactType.MODEL))
+
+        page, token = memory.query_artifacts([ArtifactQuery(name="*")], limit=2)
+        page, token = memory.query_artifacts([ArtifactQuery(name="*")], offset_token=token, limit=2)
+        assert [metadata.id for metadata in page] == ["m2", "m3"]
+        assert token is None
+
+    def test_invalid_page_token(self):
+        import pytest
+
+        from backend.models import ArtifactQuery
+        from backend.storage import InvalidPageToken, memory
+        for token in ("5", "p1.", "p1.!!!"):
+            with pytest.raises(InvalidPageToken):
+                memory.query_artifacts([ArtifactQuery(name="*")], offset_token=token)
+
+    def test_page_token_round_trip(self):
+        from backend.storage.records import (decode_page_token,
+                                             encode_page_token)
+        token = encode_page_token("abc-123")
+        assert token.startswith("p1.")
+        assert decode_page_token(token) == "abc-123"
+
+    def test_model_links_dataset_saved_later(self):
+        from backend.models import ArtifactType
+        from backend.storage import memory
+        memory.save_artifact(_artifact("m1", "model", ArtifactType.MODEL), dataset_name="SQuAD", code_name="trainer")
+        memory.save_artifact(_artifact("d1", "squad", ArtifactType.DATASET, url="https://huggingface.co/datasets/squad"))
+
+        record = memory._MODELS["m1"]
+        assert record.dataset_id == "d1"
+        assert record.dataset_url == "https://huggingface.co/datasets/squad"
+        assert record.code_id is None
+        assert memory.find_dataset_by_name("SQUAD").artifact.metadata.id == "d1"
+
+        dataset, code = memory.find_linked_artifacts("squad", "trainer")
+        assert dataset is not None and dataset.artifact.metadata.id == "d1"
+        assert code is None
+
+    def test_model_links_existing_code(self):
+        from backend.models import ArtifactType
+        from backend.storage import memory
+        memory.save_artifact(_artifact("c1", "trainer", ArtifactType.CODE, url="https://github.com/org/trainer"))
+        memory.save_artifact(_artifact("m1", "model", ArtifactType.MODEL), code_name="Trainer")
+
+        record = memory._MODELS["m1"]
+        assert record.code_id == "c1"
+        assert record.code_url == "https://github.com/org/trainer"
+
+    def test_delete_returns_artifact_and_unlinks_models(self):
+        from backend.models import ArtifactType
+        from backend.storage import memory
+        dataset = _artifact("d1", "squad", ArtifactType.DATASET)
+        memory.save_artifact(dataset)
+        memory.save_artifact(_artifact("m1", "model", ArtifactType.MODEL), dataset_name="squad")
+        assert memory._MODELS["m1"].dataset_id == "d1"
+
+        assert memory.delete_artifact(ArtifactType.DATASET, "d1") == dataset
+        assert memory.delete_artifact(ArtifactType.DATASET, "d1") is None
+        assert memory._MODELS["m1"].dataset_id is None
+        assert memory._MODELS["m1"].dataset_url is None
+        assert memory.find_dataset_by_name("squad") is None
+
+    def test_deleted_model_is_not_relinked(self):
+        from backend.models import ArtifactType
+        from backend.storage import memory
+        memory.save_artifact(_artifact("m1", "model", ArtifactType.MODEL), dataset_name="squad")
+        memory.delete_artifact(ArtifactType.MODEL, "m1")
+        memory.save_artifact(_artifact("d1", "squad", ArtifactType.DATASET))
+
+        assert "squad" not in memory._MODELS_BY_DATASET_NAME
+        assert memory.get_artifact(ArtifactType.MODEL, "m1") is None
+
+    def test_rating_cost(self):
+        from backend.storage.records import rating_cost
+        rating = MagicMock()
+        rating.size_score.raspberry_pi = 0.75
+        assert rating_cost(rating) == 250.0
+        rating.size_score.raspberry_pi = 1.5
+        assert rating_cost(rating) == 0.0
+
+
+class Test_DynamoDBStorage:
+    def setup_method(self):
+        from backend.storage import dynamodb
+        dynamodb.reset_cache()
+
+    def teardown_method(self):
+        from backend.storage import dynamodb
+        dynamodb.reset_cache()
+
+    def test_index_key_digests_long_values(self):
+        from backend.storage import dynamodb
+        short = "https://huggingface.co/bert"
+        long = "https://example.com/" + "a" * 2000
+        assert dynamodb._index_key(short) == short
+        digest = dynamodb._index_key(long)
+        assert digest.startswith("blake2b:")
+        assert len(digest.encode()) <= dynamodb.INDEX_KEY_MAX_BYTES
+        assert dynamodb._index_key(long) == digest
+        assert dynamodb._index_key(digest) == digest
+
+    def test_save_writes_digest_keys_and_lookup_uses_them(self):
+        from backend.models import ArtifactType
+        from backend.storage import dynamodb
+        long_url = "https://example.com/" + "a" * 2000
+        long_name = "n" * 1500
+        client = MagicMock()
+        client.query.return_value = {"Items": [], "Count": 1}
+
+        with patch.object(dynamodb, "_get_client", return_value=client):
+            dynamodb.save_artifact(_artifact("d1", long_name, ArtifactType.DATASET, url=long_url))
+            assert dynamodb.artifact_exists(ArtifactType.DATASET, long_url)
+
+        item = client.put_item.call_args.kwargs["Item"]
+        assert item["url"] == {"S": dynamodb._index_key(long_url)}
+        assert item["name_normalized"] == {"S": dynamodb._index_key(long_name)}
+        lookup = client.query.call_args.kwargs
+        assert lookup["ExpressionAttributeValues"][":u"] == {"S": dynamodb._index_key(long_url)}
+
+    def test_blank_name_uses_sentinel_key(self):
+        from backend.models import ArtifactType
+        from backend.storage import dynamodb
+        client = MagicMock()
+        client.query.return_value = {"Items": []}
+
+        with patch.object(dynamodb, "_get_client", return_value=client):
+            dynamodb.save_artifact(_artifact("c1", "", ArtifactType.CODE, url="https://github.com/org/repo"))
+
+        item = client.put_item.call_args.kwargs["Item"]
+        assert item["name_normalized"] == {"S": dynamodb._BLANK_NAME_KEY}
+
+    def test_identical_save_is_conditional_on_content_hash(self):
+        from botocore.exceptions import ClientError
+
+        from backend.models import ArtifactType
+        from backend.storage import dynamodb
+        client = MagicMock()
+        client.query.return_value = {"Items": []}
+        artifact = _artifact("c1", "repo", ArtifactType.CODE, url="https://github.com/org/repo")
+
+        with patch.object(dynamodb, "_get_client", return_value=client):
+            dynamodb.save_artifact(artifact)
+            client.put_item.side_effect = ClientError(
+                {"Error": {"Code": "ConditionalCheckFailedException", "Message": ""}}, "PutItem"
+            )
+            assert dynamodb.save_artifact(artifact) == artifact
+
+        first, second = (call.kwargs for call in client.put_item.call_args_list)
+        assert first["Item"]["content_hash"] == second["Item"]["content_hash"]
+        assert second["ConditionExpression"] == "attribute_not_exists(content_hash) OR content_hash <> :h"
+        assert second["ExpressionAttributeValues"][":h"] == second["Item"]["content_hash"]
+
+    def test_changed_content_changes_hash(self):
+        from backend.models import ArtifactType
+        from backend.storage import dynamodb
+        client = MagicMock()
+        client.query.return_value = {"Items": []}
+
+        with patch.object(dynamodb, "_get_client", return_value=client):
+            dynamodb.save_artifact(_artifact("c1", "repo", ArtifactType.CODE, url="https://github.com/org/repo"))
+            dynamodb.save_artifact(_artifact("c1", "repo", ArtifactType.CODE, url="https://github.com/org/repo2"))
+
+        first, second = (call.kwargs["Item"]["content_hash"] for call in client.put_item.call_args_list)
+        assert first != second
+
+
+class Test_ArtifactsPaging:
+    def setup_method(self):
+        from backend.storage import memory
+        memory.reset()
+
+    def teardown_method(self):
+        from backend.storage import memory
+        memory.reset()
+
+    def _post(self, offset=None):
+        from fastapi.testclient import TestClient
+
+        from backend.app import app
+        from backend.storage import memory
+
+        def query_artifacts(queries, *, offset_token=None):
+            return memory.query_artifacts(queries, offset_token=offset_token, limit=2)
+
+        params = {"offset": offset} if offset is not None else None
+        with patch("backend.api.routes.artifacts.query_artifacts", query_artifacts):
+            return TestClient(app).post("/artifacts", json=[{"name": "*"}], params=params)
+
+    def test_follows_offset_header_to_the_end(self):
+        from backend.models import ArtifactType
+        from backend.storage import memory
+        for i in range(5):
+            memory.save_artifact(_artifact(f"m{i}", f"model-{i}", ArtifactType.MODEL))
+
+        seen = []
+        offset = None
+        while True:
+            response = self._post(offset)
+            assert response.status_code == 200
+            seen.extend(entry["id"] for entry in response.json())
+            offset = response.headers.get("offset")
+            if offset is None:
+                break
+        assert seen == ["m0", "m1", "m2", "m3", "m4"]
+
+    def test_zero_offset_starts_from_the_beginning(self):
+        from backend.models import ArtifactType
+        from backend.storage import memory
+        for i in range(3):
+            memory.save_artifact(_artifact(f"m{i}", f"model-{i}", ArtifactType.MODEL))
+
+        response = self._post("0")
+        assert response.status_code == 200
+        assert [entry["id"] for entry in response.json()] == ["m0", "m1"]
+        assert response.headers["offset"].startswith("p1.")
+
+    def test_invalid_offset_is_rejected(self):
+        response = self._post("5")
+        assert response.status_code == 400